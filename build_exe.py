@@ -8,30 +8,71 @@
 import os
 import sys
 import shutil
+import importlib.util
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+# 便携版随附文件的固定内容：import时编码一次，写入时直接write_bytes
+START_BAT_BYTES = '''@echo off
+cd /d %~dp0
+echo 启动语音输入助手...
+"语音输入助手\\语音输入助手.exe"
+pause
+'''.encode('utf-8')
+
+USAGE_TXT_BYTES = '''语音输入助手便携版使用说明
+
+1. 首次使用：
+   - 确保已连接麦克风设备
+   - 双击"启动语音助手.bat"或"语音输入助手.exe"启动程序
+   - 程序会在系统托盘显示绿色麦克风图标
+
+2. 基本操作：
+   - 按F9键开始语音识别
+   - 清晰说出要输入的内容
+   - 程序自动识别并输入到当前光标位置
+
+3. 设置大模型优化（可选）：
+   - 复制env.example为.env
+   - 在.env文件中填入OpenAI API Key
+   - 右键托盘图标 -> 设置 -> 大模型优化 -> 启用
+
+4. 自定义设置：
+   - 右键托盘图标选择"设置"
+   - 可以修改热键、录音时长、输入方式等
+
+5. 注意事项：
+   - 请在安静环境中使用
+   - 保持正常语速说话
+   - 支持Excel、Word、微信等各种应用
+
+如有问题请查看README.md文件或访问项目主页。
+'''.encode('utf-8')
+
+
 def check_pyinstaller():
     """检查PyInstaller是否已安装"""
-    try:
-        import PyInstaller
+    # find_spec只查询导入机制，不执行PyInstaller的模块初始化
+    if importlib.util.find_spec('PyInstaller') is not None:
         print("PyInstaller已安装")
         return True
-    except ImportError:
-        print("PyInstaller未安装，正在安装...")
-        try:
-            subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
-            print("PyInstaller安装完成")
-            return True
-        except subprocess.CalledProcessError:
-            print("PyInstaller安装失败")
-            return False
+
+    print("PyInstaller未安装，正在安装...")
+    try:
+        subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
+        print("PyInstaller安装完成")
+        return True
+    except subprocess.CalledProcessError:
+        print("PyInstaller安装失败")
+        return False
 
 
 def clean_build_files():
     """清理构建文件"""
-    dirs_to_remove = ['build', 'dist', '__pycache__']
+    # 不清理__pycache__：源码树的pycache与PyInstaller输出无关
+    dirs_to_remove = ['build', 'dist']
     
     for dir_name in dirs_to_remove:
         if os.path.exists(dir_name):
@@ -42,6 +83,16 @@ def clean_build_files():
 def create_icon():
     """创建应用图标"""
     icon_path = Path('assets/icon.ico')
+    sig_path = Path('assets/.icon.sig')
+
+    # 以本函数源码的哈希做缓存签名：绘制逻辑没变就直接复用已有图标
+    import hashlib
+    import inspect
+    sig = hashlib.sha256(inspect.getsource(create_icon).encode()).hexdigest()
+
+    if icon_path.exists() and sig_path.exists() and sig_path.read_text() == sig:
+        return
+
     if not icon_path.exists():
         print("创建默认图标...")
         try:
@@ -83,15 +134,19 @@ def create_icon():
             draw.rectangle([base_x, base_y, base_x + base_width, base_y + base_height], 
                          fill=(255, 255, 255, 255))
             
-            # 保存图标
+            # 保存图标：只在256×256画一次，多尺寸由PIL的C重采样生成
             icon_path.parent.mkdir(exist_ok=True)
             image.save(icon_path, format='ICO', sizes=[(16, 16), (32, 32), (48, 48), (256, 256)])
+            sig_path.write_text(sig)
             print(f"图标已创建: {icon_path}")
-            
+
         except ImportError:
             print("PIL不可用，跳过图标创建")
         except Exception as e:
             print(f"创建图标失败: {e}")
+    else:
+        # 图标存在但签名缺失/过期：补写签名，后续构建走缓存
+        sig_path.write_text(sig)
 
 
 def prepare_build_files():
@@ -116,12 +171,11 @@ def prepare_build_files():
         src_path = Path(src)
         dst_path = assets_dir / dst
         if src_path.exists():
-            import shutil
             shutil.copy2(src_path, dst_path)
             print(f"复制文件: {src} -> {dst_path}")
 
 
-def build_exe():
+def build_exe(fresh=False, onefile=False):
     """构建exe文件"""
     print("开始构建exe文件...")
     
@@ -132,48 +186,75 @@ def build_exe():
         # 检查图标文件
         icon_file = Path('assets/icon.ico')
         icon_arg = f'--icon={icon_file}' if icon_file.exists() else ''
-        
+
+        # 默认走spec文件：PyInstaller可复用build/里的Analysis缓存，
+        # 源码未变时跳过模块图分析；onefile模式仍走CLI参数
+        spec_file = Path('语音输入助手.spec')
+        use_spec = spec_file.exists() and not onefile
+
         # 构建命令
-        cmd = [
-            sys.executable, '-m', 'PyInstaller',
-            '--onefile',
-            '--windowed',
-            '--name=语音输入助手',
-            '--add-data=config;config',
-            '--add-data=assets;assets',
-            '--add-data=env.example;.',
-            '--add-data=README.md;.',
-            '--add-data=LICENSE;.',
-            '--hidden-import=whisper',
-            '--hidden-import=openai',
-            '--hidden-import=PyQt5',
-            '--hidden-import=PyQt5.QtCore',
-            '--hidden-import=PyQt5.QtGui',
-            '--hidden-import=PyQt5.QtWidgets',
-            '--hidden-import=sounddevice',
-            '--hidden-import=pyautogui',
-            '--hidden-import=pynput',
-            '--hidden-import=pynput.keyboard',
-            '--hidden-import=pynput.mouse',
-            '--hidden-import=loguru',
-            '--hidden-import=win32api',
-            '--hidden-import=win32con',
-            '--hidden-import=win32gui',
-            '--hidden-import=win32clipboard',
-            '--hidden-import=psutil',
-            '--hidden-import=numpy',
-            '--hidden-import=torch',
-            '--hidden-import=torchaudio',
-            '--hidden-import=librosa',
-            '--hidden-import=dotenv',
-            '--exclude-module=matplotlib',
-            '--exclude-module=tk',
-            '--exclude-module=tkinter',
-            '--clean',
-            '--noconfirm',
-            'start_silent.py'  # 使用静默启动脚本
-        ]
-        
+        if use_spec:
+            cmd = [
+                sys.executable, '-m', 'PyInstaller',
+                '--noconfirm',
+                str(spec_file),
+            ]
+            icon_arg = ''  # 图标已写在spec里
+        else:
+            cmd = [
+                sys.executable, '-m', 'PyInstaller',
+                # 默认onedir：避免onefile每次启动时解包运行时到临时目录
+                '--onefile' if onefile else '--onedir',
+                '--windowed',
+                '--name=语音输入助手',
+                '--add-data=config;config',
+                '--add-data=assets;assets',
+                '--add-data=env.example;.',
+                '--add-data=README.md;.',
+                '--add-data=LICENSE;.',
+                '--hidden-import=whisper',
+                '--hidden-import=openai',
+                '--hidden-import=PyQt5',
+                '--hidden-import=PyQt5.QtCore',
+                '--hidden-import=PyQt5.QtGui',
+                '--hidden-import=PyQt5.QtWidgets',
+                '--hidden-import=sounddevice',
+                '--hidden-import=pyautogui',
+                '--hidden-import=pynput',
+                '--hidden-import=pynput.keyboard',
+                '--hidden-import=pynput.mouse',
+                '--hidden-import=loguru',
+                '--hidden-import=win32api',
+                '--hidden-import=win32con',
+                '--hidden-import=win32gui',
+                '--hidden-import=win32clipboard',
+                '--hidden-import=psutil',
+                '--hidden-import=numpy',
+                '--hidden-import=torch',
+                '--hidden-import=torchaudio',
+                '--hidden-import=librosa',
+                '--hidden-import=dotenv',
+                '--exclude-module=matplotlib',
+                '--exclude-module=tk',
+                '--exclude-module=tkinter',
+                # torch/librosa的传递依赖会拉进这些大包，运行时并不需要
+                # （scipy和sympy除外：librosa的特征提取依赖scipy，torch 2.x需要sympy）
+                '--exclude-module=pandas',
+                '--exclude-module=IPython',
+                '--exclude-module=notebook',
+                '--exclude-module=pytest',
+                '--exclude-module=test',
+                '--exclude-module=pydoc_data',
+                # 打包字节码去掉docstring/assert，PYZ更小、冷启动读盘更少
+                '--optimize=2',
+                '--noconfirm',
+                'start_silent.py'  # 使用静默启动脚本
+            ]
+
+        # 全新构建时清空PyInstaller缓存（默认复用缓存以加速增量构建）
+        if fresh:
+            cmd.append('--clean')
+
         # 添加图标参数
         if icon_arg:
             cmd.append(icon_arg)
@@ -181,17 +262,28 @@ def build_exe():
         print("执行构建命令...")
         print(f"命令: {' '.join(cmd)}")
         
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        
+        # 流式输出构建日志：实时显示进度，避免把几十MB日志全部缓存在内存里
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, text=True, bufsize=1)
+        for line in process.stdout:
+            print(line, end='')
+        returncode = process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+
         print("构建成功!")
-        print(f"输出: {result.stdout}")
         
-        # 检查输出文件
-        exe_path = Path('dist/语音输入助手.exe')
+        # 检查输出文件（onedir模式输出为目录）
+        if onefile:
+            app_dir = Path('dist')
+            exe_path = app_dir / '语音输入助手.exe'
+        else:
+            app_dir = Path('dist/语音输入助手')
+            exe_path = app_dir / '语音输入助手.exe'
         if exe_path.exists():
-            size_mb = exe_path.stat().st_size / (1024 * 1024)
-            print(f"exe文件大小: {size_mb:.1f} MB")
-            print(f"输出路径: {exe_path.absolute()}")
+            size_mb = sum(f.stat().st_size for f in app_dir.rglob('*') if f.is_file()) / (1024 * 1024)
+            print(f"程序目录大小: {size_mb:.1f} MB")
+            print(f"输出路径: {app_dir.absolute()}")
             
             # 创建便携版文件夹
             create_portable_version(exe_path)
@@ -213,71 +305,41 @@ def create_portable_version(exe_path):
     print("创建便携版...")
     
     try:
-        import shutil
-        
         portable_dir = Path('dist/语音输入助手_便携版')
         portable_dir.mkdir(exist_ok=True)
-        
-        # 复制exe文件
-        shutil.copy2(exe_path, portable_dir / '语音输入助手.exe')
-        
-        # 复制配置文件
-        config_dir = portable_dir / 'config'
-        config_dir.mkdir(exist_ok=True)
-        
-        if Path('config/config.example.ini').exists():
-            shutil.copy2('config/config.example.ini', config_dir / 'config.example.ini')
-            
-        # 复制环境变量示例
-        if Path('env.example').exists():
-            shutil.copy2('env.example', portable_dir / 'env.example')
-            
-        # 复制文档
-        for doc_file in ['README.md', 'LICENSE']:
-            if Path(doc_file).exists():
-                shutil.copy2(doc_file, portable_dir / doc_file)
-        
-        # 创建启动脚本
-        start_bat = portable_dir / '启动语音助手.bat'
-        with open(start_bat, 'w', encoding='utf-8') as f:
-            f.write('''@echo off
-cd /d %~dp0
-echo 启动语音输入助手...
-"语音输入助手.exe"
-pause
-''')
-        
-        # 创建使用说明
-        usage_txt = portable_dir / '使用说明.txt'
-        with open(usage_txt, 'w', encoding='utf-8') as f:
-            f.write('''语音输入助手便携版使用说明
-
-1. 首次使用：
-   - 确保已连接麦克风设备
-   - 双击"启动语音助手.bat"或"语音输入助手.exe"启动程序
-   - 程序会在系统托盘显示绿色麦克风图标
 
-2. 基本操作：
-   - 按F9键开始语音识别
-   - 清晰说出要输入的内容
-   - 程序自动识别并输入到当前光标位置
+        # 程序目录拷贝（大头）和小文件拷贝并行执行：
+        # 小文件的耗时完全隐藏在大目录拷贝里
+        app_dir = exe_path.parent
 
-3. 设置大模型优化（可选）：
-   - 复制env.example为.env
-   - 在.env文件中填入OpenAI API Key
-   - 右键托盘图标 -> 设置 -> 大模型优化 -> 启用
+        def copy_app():
+            if app_dir.name == '语音输入助手':
+                shutil.copytree(app_dir, portable_dir / '语音输入助手', dirs_exist_ok=True)
+            else:
+                # onefile模式下只有单个exe
+                (portable_dir / '语音输入助手').mkdir(exist_ok=True)
+                shutil.copy2(exe_path, portable_dir / '语音输入助手' / '语音输入助手.exe')
 
-4. 自定义设置：
-   - 右键托盘图标选择"设置"
-   - 可以修改热键、录音时长、输入方式等
+        config_dir = portable_dir / 'config'
+        config_dir.mkdir(exist_ok=True)
 
-5. 注意事项：
-   - 请在安静环境中使用
-   - 保持正常语速说话
-   - 支持Excel、Word、微信等各种应用
+        small_files = [
+            ('config/config.example.ini', config_dir / 'config.example.ini'),
+            ('env.example', portable_dir / 'env.example'),
+            ('README.md', portable_dir / 'README.md'),
+            ('LICENSE', portable_dir / 'LICENSE'),
+        ]
+        pairs = [(src, dst) for src, dst in small_files if Path(src).exists()]
 
-如有问题请查看README.md文件或访问项目主页。
-''')
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(copy_app)]
+            futures += [pool.submit(shutil.copy2, src, dst) for src, dst in pairs]
+            for future in futures:
+                future.result()
+        
+        # 创建启动脚本和使用说明（内容是模块级常量，直接写字节）
+        (portable_dir / '启动语音助手.bat').write_bytes(START_BAT_BYTES)
+        (portable_dir / '使用说明.txt').write_bytes(USAGE_TXT_BYTES)
         
         print(f"便携版已创建: {portable_dir}")
         
@@ -294,18 +356,28 @@ def main():
     """主函数"""
     print("语音输入助手打包工具")
     print("=" * 50)
-    
+
+    # --fresh: 清理旧构建文件并让PyInstaller重新分析所有模块
+    # 默认复用build/目录和PyInstaller缓存，增量构建更快
+    fresh = '--fresh' in sys.argv or '--clean' in sys.argv
+    # --onefile: 生成单文件exe（启动较慢，仅在需要时使用）
+    onefile = '--onefile' in sys.argv
+
     # 检查PyInstaller
     if not check_pyinstaller():
         return False
-    
-    # 清理旧的构建文件
-    clean_build_files()
-    
+
+    # 清理旧的构建文件（仅在--fresh时）
+    if fresh:
+        clean_build_files()
+
     # 构建exe
-    if build_exe():
+    if build_exe(fresh=fresh, onefile=onefile):
         print("\n构建完成!")
-        print("文件输出: dist/语音输入助手.exe")
+        if onefile:
+            print("文件输出: dist/语音输入助手.exe")
+        else:
+            print("文件输出: dist/语音输入助手/")
         return True
     else:
         print("构建失败")
@@ -6,7 +6,10 @@
 import os
 import sys
 import subprocess
+import multiprocessing
 import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 def check_python_version():
@@ -17,26 +20,39 @@ def check_python_version():
 
 def check_dependencies():
     """检查依赖包"""
-    required = ['openai', 'whisper', 'sounddevice', 'pyautogui', 'pynput', 
-                'loguru', 'PyQt5', 'psutil', 'requests', 'numpy', 'torch',
-                'python-dotenv', 'pillow', 'pyinstaller']
-    
-    missing = []
-    for package in required:
+    # 包名 -> 实际导入的模块名
+    required = {
+        'openai': 'openai', 'whisper': 'whisper', 'sounddevice': 'sounddevice',
+        'pyautogui': 'pyautogui', 'pynput': 'pynput', 'loguru': 'loguru',
+        'PyQt5': 'PyQt5', 'psutil': 'psutil', 'requests': 'requests',
+        'numpy': 'numpy', 'torch': 'torch', 'python-dotenv': 'dotenv',
+        'pillow': 'PIL', 'pyinstaller': 'PyInstaller',
+    }
+
+    def probe(package, module):
+        # find_spec只查询导入机制，不执行模块代码（导入torch本身要花数秒）
+        try:
+            if importlib.util.find_spec(module) is not None:
+                return package, True
+        except (ImportError, ValueError):
+            pass
+        # 兜底：命名空间包等边缘情况下再尝试真实导入
         try:
-            if package == 'PyQt5':
-                import PyQt5
-            elif package == 'python-dotenv':
-                import dotenv
-            elif package == 'pillow':
-                import PIL
-            elif package == 'pyinstaller':
-                import PyInstaller
-            else:
-                importlib.import_module(package)
+            importlib.import_module(module)
+            return package, True
         except ImportError:
-            missing.append(package)
-    
+            return package, False
+
+    # 并发导入：导入时的文件系统探测会释放GIL，
+    # 多线程下探测阶段基本可以并行
+    missing = []
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(probe, pkg, mod) for pkg, mod in required.items()]
+        for future in as_completed(futures):
+            package, ok = future.result()
+            if not ok:
+                missing.append(package)
+
     if missing:
         return False, f"缺少依赖包: {missing}"
     return True, "所有依赖包已安装"
@@ -50,7 +66,22 @@ def check_files():
         'requirements.txt', 'env.example', 'README.md', 'LICENSE'
     ]
     
-    missing = [f for f in required if not Path(f).exists()]
+    # 按父目录分组，每个目录只做一次scandir，取代逐文件stat
+    wanted_by_dir = {}
+    for f in required:
+        parent, name = os.path.split(f)
+        wanted_by_dir.setdefault(parent or '.', set()).add(name)
+
+    missing = []
+    for parent, wanted in wanted_by_dir.items():
+        try:
+            with os.scandir(parent) as entries:
+                found = {entry.name for entry in entries}
+        except OSError:
+            found = set()
+        missing.extend(os.path.join(parent, name) if parent != '.' else name
+                       for name in sorted(wanted - found))
+
     if missing:
         return False, f"缺少文件: {missing}"
     return True, "所有必要文件存在"
@@ -93,37 +124,50 @@ def check_build_system():
     except Exception as e:
         return False, f"打包系统检查失败: {e}"
 
+def run_check(check):
+    """执行单项检查（子进程入口，必须是可pickle的顶层函数）"""
+    check_name, check_func = check
+    try:
+        success, result = check_func()
+        return check_name, success, result
+    except Exception as e:
+        return check_name, False, str(e)
+
+
+CHECKS = [
+    ("Python版本", check_python_version),
+    ("依赖包", check_dependencies),
+    ("文件结构", check_files),
+    ("核心模块", check_modules),
+    ("打包系统", check_build_system),
+]
+
+
 def main():
     """主函数"""
     print("=" * 50)
     print("语音输入助手 - 发布前检查")
     print("=" * 50)
-    
-    checks = [
-        ("Python版本", check_python_version),
-        ("依赖包", check_dependencies),
-        ("文件结构", check_files),
-        ("核心模块", check_modules),
-        ("打包系统", check_build_system),
-    ]
-    
+
+    # 各项检查相互独立，放到子进程并行执行；
+    # check_modules会改sys.path并加载重量级模块，必须在独立解释器里跑
+    # （Windows下spawn是强制的）
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(len(CHECKS)) as pool:
+        results = pool.map(run_check, CHECKS)
+
     passed = 0
     failed = 0
-    
-    for check_name, check_func in checks:
+
+    for check_name, success, result in results:
         print(f"\n📋 检查: {check_name}")
-        try:
-            success, result = check_func()
-            if success:
-                print(f"✅ 通过: {result}")
-                passed += 1
-            else:
-                print(f"❌ 失败: {result}")
-                failed += 1
-        except Exception as e:
-            print(f"❌ 错误: {e}")
+        if success:
+            print(f"✅ 通过: {result}")
+            passed += 1
+        else:
+            print(f"❌ 失败: {result}")
             failed += 1
-    
+
     print("\n" + "=" * 50)
     print(f"检查结果: {passed} 通过, {failed} 失败")
     
@@ -79,33 +79,22 @@ def clean_cache():
     print("清理缓存文件...")
     
     try:
-        # 清理__pycache__目录
-        cache_dirs = []
-        for root, dirs, files in os.walk('.'):
-            if '__pycache__' in dirs:
-                cache_dirs.append(os.path.join(root, '__pycache__'))
-        
-        for cache_dir in cache_dirs:
+        # 清理__pycache__目录：边遍历边删除，整目录一次rmtree
+        for cache_dir in Path('.').rglob('__pycache__'):
             try:
-                shutil.rmtree(cache_dir)
+                shutil.rmtree(cache_dir, ignore_errors=True)
                 print(f"✓ 清理缓存: {cache_dir}")
             except Exception as e:
                 print(f"清理缓存失败: {cache_dir} - {e}")
-        
-        # 清理.pyc文件
-        pyc_files = []
-        for root, dirs, files in os.walk('.'):
-            for file in files:
-                if file.endswith('.pyc'):
-                    pyc_files.append(os.path.join(root, file))
-        
-        for pyc_file in pyc_files:
+
+        # 清理残留的.pyc文件（__pycache__外的散落文件）
+        for pyc_file in Path('.').rglob('*.pyc'):
             try:
-                os.remove(pyc_file)
+                pyc_file.unlink(missing_ok=True)
                 print(f"✓ 清理文件: {pyc_file}")
             except Exception as e:
                 print(f"清理文件失败: {pyc_file} - {e}")
-        
+
         return True
         
     except Exception as e:
@@ -132,8 +121,15 @@ def reinstall_requirements():
         requirements_file = Path("requirements.txt")
         if requirements_file.exists():
             print("从requirements.txt安装依赖...")
-            subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt", "--upgrade"], 
-                         check=True)
+            # 固定wheel缓存目录并优先二进制包：
+            # torch/PyQt5从源码构建极慢，重复修复时直接命中缓存
+            pip_cache = Path.home() / ".cache" / "voice_input_assistant" / "pip"
+            pip_cache.mkdir(parents=True, exist_ok=True)
+            subprocess.run([sys.executable, "-m", "pip", "install",
+                            "-r", "requirements.txt", "--upgrade",
+                            "--prefer-binary",
+                            "--cache-dir", str(pip_cache)],
+                           check=True)
             print("✓ 依赖包重新安装完成")
         else:
             print("警告: requirements.txt 不存在")
@@ -4,10 +4,11 @@
 用于测试和优化语音识别设置
 """
 
+# 重量级模块（numpy/sounddevice/torch/whisper）都在函数内按需导入：
+# 菜单秒开，退出路径完全不碰torch
 import sys
 import time
-import numpy as np
-import sounddevice as sd
+import math
 from pathlib import Path
 from loguru import logger
 
@@ -15,12 +16,51 @@ from loguru import logger
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir / "src"))
 
-from core.voice_recognizer import VoiceRecognizer
-from utils.config_manager import ConfigManager
+_chunk_stats = None
+
+
+def _get_chunk_stats():
+    """懒构建音频块统计内核（numba可选，无则退回numpy）"""
+    global _chunk_stats
+    if _chunk_stats is not None:
+        return _chunk_stats
+
+    import numpy as np
+
+    try:
+        import numba
+
+        @numba.njit(cache=True, fastmath=True)
+        def chunk_stats(a):
+            """单遍统计：abs和、abs最大值、平方和（一次内存遍历）"""
+            s = 0.0
+            m = 0.0
+            ss = 0.0
+            for i in range(a.size):
+                # 先升到float64再取abs：int16输入时v*v会在整型里
+                # 回绕，abs(-32768)也还是-32768
+                v = abs(np.float64(a[i]))
+                s += v
+                if v > m:
+                    m = v
+                ss += v * v
+            return s, m, ss
+    except ImportError:
+        def chunk_stats(a):
+            """numpy退路：abs只算一次，三个归约共享中间数组"""
+            # 先升到float64：int16输入时避免abs(-32768)和平方和溢出
+            abs_a = np.abs(a.astype(np.float64))
+            return float(abs_a.sum()), float(abs_a.max()), float(np.dot(abs_a, abs_a))
+
+    _chunk_stats = chunk_stats
+    return _chunk_stats
 
 
 def test_microphone():
     """测试麦克风设备"""
+    import numpy as np
+    import sounddevice as sd
+
     print("🎤 检测音频设备...")
     devices = sd.query_devices()
     
@@ -35,17 +75,33 @@ def test_microphone():
     # 录音测试
     print("\n正在进行5秒录音测试...")
     print("请说话...")
-    
-    audio_data = sd.rec(5 * 16000, samplerate=16000, channels=1, dtype=np.float32)
-    sd.wait()
-    
-    # 检查音频质量
-    volume_level = np.abs(audio_data).mean()
-    max_volume = np.abs(audio_data).max()
-    
+
+    # 回调内增量统计，不保留完整录音缓冲
+    chunk_stats = _get_chunk_stats()
+    stats = {'sum_abs': 0.0, 'max_abs': 0.0, 'sum_sq': 0.0, 'samples': 0}
+
+    def audio_callback(indata, frames, time_info, status):
+        s, m, ss = chunk_stats(indata.ravel())
+        stats['sum_abs'] += s
+        stats['max_abs'] = max(stats['max_abs'], m)
+        stats['sum_sq'] += ss
+        stats['samples'] += frames
+
+    # int16录音：是声卡的原生格式，内存带宽和SIMD吞吐都比float32翻倍
+    with sd.InputStream(samplerate=16000, channels=1, dtype=np.int16,
+                        blocksize=1600, callback=audio_callback):
+        sd.sleep(5000)
+
+    # 报告时才归一化到[0, 1]
+    total = max(stats['samples'], 1)
+    volume_level = stats['sum_abs'] / total / 32768.0
+    max_volume = stats['max_abs'] / 32768.0
+    rms = math.sqrt(stats['sum_sq'] / total) / 32768.0
+
     print(f"音频质量检测:")
     print(f"  平均音量: {volume_level:.4f}")
     print(f"  最大音量: {max_volume:.4f}")
+    print(f"  RMS音量: {rms:.4f}")
     
     if volume_level < 0.001:
         print("  ⚠️  音量过低，请检查麦克风设置")
@@ -53,15 +109,17 @@ def test_microphone():
         print("  ⚠️  音量过高，可能会产生失真")
     else:
         print("  ✅ 音量正常")
-    
-    return audio_data
+
+    return volume_level
 
 
 def optimize_config():
     """优化配置"""
+    from utils.config_manager import ConfigManager
+
     print("🔧 语音识别优化配置")
     print("=" * 50)
-    
+
     config = ConfigManager()
     
     # 1. 模型选择
@@ -129,9 +187,12 @@ def optimize_config():
 
 def test_recognition_with_config():
     """使用当前配置测试识别"""
+    from core.voice_recognizer import VoiceRecognizer
+    from utils.config_manager import ConfigManager
+
     print("🎯 测试语音识别准确率")
     print("=" * 50)
-    
+
     config = ConfigManager()
     
     # 显示当前配置
@@ -0,0 +1,148 @@
+"""
+Win32原生热键后端
+通过RegisterHotKey注册全局热键：匹配在内核侧完成，
+只有组合键命中时才收到WM_HOTKEY，完全绕开逐按键的Python回调
+"""
+
+import ctypes
+import ctypes.wintypes
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from loguru import logger
+
+try:
+    _user32 = ctypes.windll.user32
+    AVAILABLE = True
+except AttributeError:
+    # 非Windows平台（仅供开发环境导入）
+    _user32 = None
+    AVAILABLE = False
+
+# Win32常量
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+
+WM_HOTKEY = 0x0312
+WM_QUIT = 0x0012
+
+# 修饰键名 -> fsModifiers标志
+MODIFIER_FLAGS: Dict[str, int] = {
+    'ctrl': MOD_CONTROL,
+    'shift': MOD_SHIFT,
+    'alt': MOD_ALT,
+    'cmd': MOD_WIN,
+    'win': MOD_WIN,
+}
+
+# 键名 -> 虚拟键码（静态表，import时建好）
+VK_CODES: Dict[str, int] = {}
+VK_CODES.update({f'f{i}': 0x70 + i - 1 for i in range(1, 13)})   # F1-F12
+VK_CODES.update({chr(c): c - 0x20 for c in range(ord('a'), ord('z') + 1)})  # a-z
+VK_CODES.update({str(d): 0x30 + d for d in range(10)})           # 0-9
+VK_CODES.update({
+    'space': 0x20,
+    'esc': 0x1B,
+    'escape': 0x1B,
+    'tab': 0x09,
+    'enter': 0x0D,
+    'backspace': 0x08,
+    'insert': 0x2D,
+    'delete': 0x2E,
+    'home': 0x24,
+    'end': 0x23,
+    'page_up': 0x21,
+    'page_down': 0x22,
+    'up': 0x26,
+    'down': 0x28,
+    'left': 0x25,
+    'right': 0x27,
+})
+
+
+def resolve(key: str, modifier: Optional[str]) -> Optional[Tuple[int, int]]:
+    """键名+修饰键 -> (fsModifiers, vk)；无法表达时返回None"""
+    vk = VK_CODES.get(key.lower()) if key else None
+    if vk is None:
+        return None
+    mods = 0
+    if modifier:
+        flag = MODIFIER_FLAGS.get(modifier.lower())
+        if flag is None:
+            return None
+        mods |= flag
+    return mods | MOD_NOREPEAT, vk
+
+
+class Win32HotkeyListener:
+    """RegisterHotKey消息循环监听器
+
+    热键必须在消息循环所在线程注册（RegisterHotKey绑定线程），
+    所以注册和GetMessage都放在专属线程里。
+    """
+
+    def __init__(self):
+        # (fsModifiers, vk, callback)
+        self._registrations: List[Tuple[int, int, Callable]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id: Optional[int] = None
+        self._started = threading.Event()
+        self._register_ok = False
+
+    def add_hotkey(self, mods: int, vk: int, callback: Callable):
+        """添加一个热键注册（须在start之前调用）"""
+        self._registrations.append((mods, vk, callback))
+
+    def start(self) -> bool:
+        """启动消息循环线程；全部注册成功返回True"""
+        if not AVAILABLE or not self._registrations:
+            return False
+
+        self._started.clear()
+        self._thread = threading.Thread(target=self._message_loop, daemon=True)
+        self._thread.start()
+        self._started.wait(timeout=2.0)
+        return self._register_ok
+
+    def stop(self):
+        """退出消息循环并注销热键"""
+        if self._thread_id is not None:
+            _user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._thread_id = None
+
+    def _message_loop(self):
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+
+        callbacks: Dict[int, Callable] = {}
+        ok = True
+        for hotkey_id, (mods, vk, callback) in enumerate(self._registrations, start=1):
+            if _user32.RegisterHotKey(None, hotkey_id, mods, vk):
+                callbacks[hotkey_id] = callback
+            else:
+                # 大概率被其它程序占用
+                logger.warning(f"RegisterHotKey失败: mods={mods:#x} vk={vk:#x}")
+                ok = False
+
+        self._register_ok = ok and bool(callbacks)
+        self._started.set()
+
+        if not self._register_ok:
+            for hotkey_id in callbacks:
+                _user32.UnregisterHotKey(None, hotkey_id)
+            return
+
+        try:
+            msg = ctypes.wintypes.MSG()
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                if msg.message == WM_HOTKEY:
+                    callback = callbacks.get(msg.wParam)
+                    if callback:
+                        callback()
+        finally:
+            for hotkey_id in callbacks:
+                _user32.UnregisterHotKey(None, hotkey_id)
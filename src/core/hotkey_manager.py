@@ -5,6 +5,7 @@
 
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Optional, Dict, List
 from pynput import keyboard
 from loguru import logger
@@ -12,34 +13,79 @@ import win32api
 import win32con
 import win32gui
 
+from core import _win_hotkeys
+
+# 修饰键名 -> 虚拟键码别名集合（左右键+通用码）
+_MODIFIER_VKS = {
+    'ctrl': frozenset((0x11, 0xA2, 0xA3)),
+    'shift': frozenset((0x10, 0xA0, 0xA1)),
+    'alt': frozenset((0x12, 0xA4, 0xA5)),
+    'cmd': frozenset((0x5B, 0x5C)),
+    'win': frozenset((0x5B, 0x5C)),
+}
+
+# 全部修饰键虚拟键码（用于失焦后的状态校准）
+_ALL_MODIFIER_VKS = frozenset().union(*_MODIFIER_VKS.values())
+
+# 虚拟键码 -> 键名（仅用于日志和对外查询接口）
+_VK_TO_NAME = {vk: name for name, vk in _win_hotkeys.VK_CODES.items()}
+_VK_TO_NAME.update({
+    0x11: 'ctrl', 0xA2: 'ctrl_l', 0xA3: 'ctrl_r',
+    0x10: 'shift', 0xA0: 'shift_l', 0xA1: 'shift_r',
+    0x12: 'alt', 0xA4: 'alt_l', 0xA5: 'alt_r',
+    0x5B: 'cmd_l', 0x5C: 'cmd_r',
+})
+
+
+def _vk_of(key) -> Optional[int]:
+    """取pynput按键对象的虚拟键码（无字符串分配的热路径）"""
+    vk = getattr(key, 'vk', None)
+    if vk is not None:
+        return vk
+    # 特殊键：Key.f9.value.vk
+    value = getattr(key, 'value', None)
+    if value is not None:
+        return getattr(value, 'vk', None)
+    return None
+
 
 class HotkeyManager:
     """热键管理器"""
-    
+
     def __init__(self):
         self.callback: Optional[Callable] = None
         self.exit_callback: Optional[Callable] = None
         self.listener: Optional[keyboard.Listener] = None
+        self.native_listener: Optional[_win_hotkeys.Win32HotkeyListener] = None
         self.is_running = False
         
-        # 默认热键配置
+        # 默认热键配置（_key_vk/_mod_vks为预计算的虚拟键码）
         self.hotkey_config = {
             'key': 'f9',  # 默认热键
             'modifier': None,  # 修饰键：shift, ctrl, alt
-            'press_type': 'press'  # press, release, hold
+            'press_type': 'press',  # press, release, hold
+            '_key_vk': _win_hotkeys.VK_CODES['f9'],
+            '_mod_vks': None
         }
-        
+
         # 退出热键配置
         self.exit_hotkey_config = {
             'key': 'f12',  # 退出热键
             'modifier': 'ctrl',  # Ctrl+F12
-            'press_type': 'press'
+            'press_type': 'press',
+            '_key_vk': _win_hotkeys.VK_CODES['f12'],
+            '_mod_vks': _MODIFIER_VKS['ctrl']
         }
-        
-        # 按键状态跟踪
-        self.pressed_keys = set()
-        self.hotkey_pressed = False
-        self.exit_hotkey_pressed = False
+
+        # 按键状态跟踪：存虚拟键码int，免去每次事件的字符串分配
+        self.pressed_vks = set()
+
+        # 常驻回调分发线程：触发时O(1)入队，
+        # 不在监听回调里做线程创建（那会阻塞下一个按键事件）
+        self._dispatch: Optional[ThreadPoolExecutor] = None
+
+        # pynput C层过滤用的VK集合（start()时重建）
+        self._interesting_vks = frozenset()
         
     def set_callback(self, callback: Callable):
         """设置热键回调函数"""
@@ -51,18 +97,27 @@ class HotkeyManager:
         
     def set_hotkey(self, key: str, modifier: Optional[str] = None, press_type: str = 'press'):
         """设置热键"""
+        modifier = modifier.lower() if modifier else None
+        key = key.lower()
         self.hotkey_config = {
-            'key': key.lower(),
-            'modifier': modifier.lower() if modifier else None,
-            'press_type': press_type
+            'key': key,
+            'modifier': modifier,
+            'press_type': press_type,
+            '_key_vk': _win_hotkeys.VK_CODES.get(key),
+            '_mod_vks': _MODIFIER_VKS.get(modifier, frozenset()) if modifier else None
         }
         
         logger.info(f"热键已设置为: {self._get_hotkey_description()}")
-        
-        # 如果监听器正在运行，重启它
+
+        # pynput监听器保持存活：配置dict和VK过滤集原子换新即可，
+        # 不重装键盘钩子（重装间隙会丢按键）。
+        # 原生RegisterHotKey绑定具体组合键，只有那条路径需要重启
         if self.is_running:
-            self.stop()
-            self.start()
+            if self.native_listener:
+                self.stop()
+                self.start()
+            else:
+                self._interesting_vks = self._build_interesting_vks()
             
     def _get_hotkey_description(self) -> str:
         """获取热键描述"""
@@ -79,62 +134,145 @@ class HotkeyManager:
             return
             
         self.is_running = True
-        
+
         try:
-            # 创建键盘监听器
+            # 优先走Win32 RegisterHotKey：组合键匹配在内核侧完成，
+            # 只有命中时才回调Python，避免逐按键的监听开销
+            if self._start_native():
+                logger.info(f"原生热键监听已启动，热键: {self._get_hotkey_description()}")
+                return
+
+            # 退路：RegisterHotKey无法表达的组合（如release/hold触发）用pynput。
+            # win32_event_filter在C层回调里先按VK过滤：
+            # 与热键无关的按键连pynput的Key对象都不会构造
+            self._interesting_vks = self._build_interesting_vks()
             self.listener = keyboard.Listener(
                 on_press=self._on_key_press,
-                on_release=self._on_key_release
+                on_release=self._on_key_release,
+                win32_event_filter=self._win32_event_filter
             )
-            
+
             # 启动监听器
             self.listener.start()
             logger.info(f"热键监听器已启动，热键: {self._get_hotkey_description()}")
-            
+
         except Exception as e:
             logger.error(f"启动热键监听器失败: {e}")
             self.is_running = False
             raise
-            
+
+    def _hotkey_configs_for_filter(self) -> list:
+        """参与VK过滤的热键配置列表"""
+        return [self.hotkey_config, self.exit_hotkey_config]
+
+    def _build_interesting_vks(self) -> frozenset:
+        """收集所有热键主键VK和修饰键VK"""
+        vks = set()
+        for config in self._hotkey_configs_for_filter():
+            if isinstance(config, HotkeyEntry):
+                vks.add(config.key_vk)
+                if config.mod_vks:
+                    vks |= config.mod_vks
+                continue
+            key_vk = config.get('_key_vk')
+            if key_vk is None:
+                key_vk = _win_hotkeys.VK_CODES.get(config['key'], -1)
+            vks.add(key_vk)
+            modifier = config.get('modifier')
+            if modifier:
+                vks |= _MODIFIER_VKS.get(modifier, frozenset())
+        return frozenset(vks)
+
+    def _win32_event_filter(self, msg, data):
+        """pynput C层过滤器：返回False则跳过Python回调（事件照常传给系统）"""
+        return data.vkCode in self._interesting_vks
+
+    def _native_registrations(self) -> Optional[list]:
+        """构造RegisterHotKey注册表；有任一热键无法表达时返回None"""
+        registrations = []
+        for config, trigger in [(self.hotkey_config, self._trigger_hotkey),
+                                (self.exit_hotkey_config, self._trigger_exit_hotkey)]:
+            if config['press_type'] != 'press':
+                return None
+            resolved = _win_hotkeys.resolve(config['key'], config['modifier'])
+            if resolved is None:
+                return None
+            mods, vk = resolved
+            registrations.append((mods, vk, trigger))
+        return registrations
+
+    def _start_native(self) -> bool:
+        """尝试启动Win32原生热键监听"""
+        if not _win_hotkeys.AVAILABLE:
+            return False
+
+        registrations = self._native_registrations()
+        if not registrations:
+            return False
+
+        listener = _win_hotkeys.Win32HotkeyListener()
+        for mods, vk, callback in registrations:
+            listener.add_hotkey(mods, vk, callback)
+
+        if listener.start():
+            self.native_listener = listener
+            return True
+
+        # 注册失败（如热键被占用）：清理并退回pynput
+        listener.stop()
+        return False
+
     def stop(self):
         """停止热键监听"""
         if not self.is_running:
             return
-            
+
         self.is_running = False
-        
+
+        if self.native_listener:
+            self.native_listener.stop()
+            self.native_listener = None
+
         if self.listener:
             self.listener.stop()
             self.listener = None
-            
-        self.pressed_keys.clear()
-        self.hotkey_pressed = False
-        
+
+        if self._dispatch:
+            self._dispatch.shutdown(wait=False)
+            self._dispatch = None
+
+        self.pressed_vks.clear()
+
         logger.info("热键监听器已停止")
         
     def _on_key_press(self, key):
         """按键按下事件"""
         try:
-            # 获取按键名称
-            key_name = self._get_key_name(key)
-            if key_name:
-                self.pressed_keys.add(key_name)
-                
+            # 获取虚拟键码
+            vk = _vk_of(key)
+            if vk is not None:
+                # 边沿直接由按键集合前后两次匹配结果导出，
+                # 不维护独立的布尔状态（失焦时布尔会卡死在True）
+                if self.pressed_vks:
+                    self._drop_stale_modifiers()
+                was_match = self._is_hotkey_match()
+                was_exit_match = self._is_exit_hotkey_match()
+                self.pressed_vks.add(vk)
+
                 # 只对相关按键进行详细日志记录
-                if self._is_relevant_key(key_name):
-                    logger.debug(f"按键按下: {key_name}, 当前按键: {self.pressed_keys}")
-                
-                # 检查是否匹配热键
-                if self._is_hotkey_match() and not self.hotkey_pressed:
-                    self.hotkey_pressed = True
+                if self._is_relevant_vk(vk):
+                    logger.debug(f"按键按下: {_VK_TO_NAME.get(vk, vk)}, "
+                                 f"当前按键: {self.get_pressed_keys()}")
+
+                # 上升沿：本次按键使热键从不匹配变为匹配
+                if not was_match and self._is_hotkey_match():
                     logger.debug(f"热键匹配成功: {self._get_hotkey_description()}")
                     
                     if self.hotkey_config['press_type'] == 'press':
                         self._trigger_hotkey()
                         
-                # 检查是否匹配退出热键
-                if self._is_exit_hotkey_match() and not self.exit_hotkey_pressed:
-                    self.exit_hotkey_pressed = True
+                # 退出热键的上升沿
+                if not was_exit_match and self._is_exit_hotkey_match():
                     logger.info("退出热键被触发: Ctrl+F12")
                     
                     if self.exit_hotkey_config['press_type'] == 'press':
@@ -146,162 +284,133 @@ class HotkeyManager:
     def _on_key_release(self, key):
         """按键释放事件"""
         try:
-            # 获取按键名称
-            key_name = self._get_key_name(key)
-            if key_name:
-                self.pressed_keys.discard(key_name)
-                
-                # 检查热键释放
-                if self.hotkey_pressed and not self._is_hotkey_match():
-                    self.hotkey_pressed = False
-                    
+            # 获取虚拟键码
+            vk = _vk_of(key)
+            if vk is not None:
+                was_match = self._is_hotkey_match()
+                was_exit_match = self._is_exit_hotkey_match()
+                self.pressed_vks.discard(vk)
+
+                # 下降沿：本次释放使热键从匹配变为不匹配
+                if was_match and not self._is_hotkey_match():
                     if self.hotkey_config['press_type'] == 'release':
                         self._trigger_hotkey()
                         
-                # 检查退出热键释放
-                if self.exit_hotkey_pressed and not self._is_exit_hotkey_match():
-                    self.exit_hotkey_pressed = False
-                    
+                # 退出热键的下降沿
+                if was_exit_match and not self._is_exit_hotkey_match():
                     if self.exit_hotkey_config['press_type'] == 'release':
                         self._trigger_exit_hotkey()
                         
         except Exception as e:
             logger.error(f"处理按键释放事件时发生错误: {e}")
+
+    def _drop_stale_modifiers(self):
+        """校准修饰键状态：失焦期间错过的释放事件会留下悬挂的修饰键"""
+        stale = [vk for vk in self.pressed_vks
+                 if vk in _ALL_MODIFIER_VKS
+                 and not win32api.GetAsyncKeyState(vk) & 0x8000]
+        for vk in stale:
+            self.pressed_vks.discard(vk)
             
-    def _get_key_name(self, key) -> Optional[str]:
-        """获取按键名称"""
-        try:
-            # 处理特殊键（功能键等）
-            if hasattr(key, 'name'):
-                key_name = key.name.lower()
-                # 处理功能键
-                if key_name.startswith('f') and key_name[1:].isdigit():
-                    return key_name  # f1, f2, ..., f12
-                return key_name
-            elif hasattr(key, 'char') and key.char:
-                return key.char.lower()
-            else:
-                # 尝试从字符串表示中提取键名
-                key_str = str(key).lower()
-                if 'key.' in key_str:
-                    return key_str.split('.')[-1].replace('>', '')
-                return key_str
-        except Exception as e:
-            logger.debug(f"获取按键名称失败: {e}")
-            return None
-            
+    def _config_matches(self, config: dict) -> bool:
+        """检查当前按键状态是否匹配给定热键配置（热路径，纯C整数集合操作）"""
+        key_vk = config.get('_key_vk')
+        if key_vk is None:
+            # 旧式未预计算的配置：首次命中时补算并缓存
+            key_vk = config['_key_vk'] = _win_hotkeys.VK_CODES.get(config['key'], -1)
+            modifier = config['modifier']
+            config['_mod_vks'] = _MODIFIER_VKS.get(modifier, frozenset()) if modifier else None
+        if key_vk not in self.pressed_vks:
+            return False
+
+        mod_vks = config.get('_mod_vks')
+        return mod_vks is None or not mod_vks.isdisjoint(self.pressed_vks)
+
     def _is_hotkey_match(self) -> bool:
         """检查当前按键是否匹配热键"""
-        target_key = self.hotkey_config['key']
-        target_modifier = self.hotkey_config['modifier']
-        
-        # 检查主键
-        if target_key not in self.pressed_keys:
-            return False
-            
-        # 检查修饰键
-        if target_modifier:
-            modifier_keys = {
-                'ctrl': ['ctrl_l', 'ctrl_r', 'ctrl'],
-                'shift': ['shift_l', 'shift_r', 'shift'],
-                'alt': ['alt_l', 'alt_r', 'alt'],
-                'cmd': ['cmd_l', 'cmd_r', 'cmd'],
-                'win': ['cmd_l', 'cmd_r', 'cmd']
-            }
-            
-            modifier_pressed = False
-            for mod_key in modifier_keys.get(target_modifier, []):
-                if mod_key in self.pressed_keys:
-                    modifier_pressed = True
-                    break
-                    
-            if not modifier_pressed:
-                return False
-                
-        return True
-        
+        return self._config_matches(self.hotkey_config)
+
     def _is_exit_hotkey_match(self) -> bool:
         """检查当前按键是否匹配退出热键"""
-        target_key = self.exit_hotkey_config['key']
-        target_modifier = self.exit_hotkey_config['modifier']
-        
-        # 检查主键
-        if target_key not in self.pressed_keys:
-            return False
-            
-        # 检查修饰键
-        if target_modifier:
-            modifier_keys = {
-                'ctrl': ['ctrl_l', 'ctrl_r', 'ctrl'],
-                'shift': ['shift_l', 'shift_r', 'shift'],
-                'alt': ['alt_l', 'alt_r', 'alt'],
-                'cmd': ['cmd_l', 'cmd_r', 'cmd'],
-                'win': ['cmd_l', 'cmd_r', 'cmd']
-            }
-            
-            modifier_pressed = False
-            for mod_key in modifier_keys.get(target_modifier, []):
-                if mod_key in self.pressed_keys:
-                    modifier_pressed = True
-                    break
-                    
-            if not modifier_pressed:
-                return False
-                
-        return True
+        return self._config_matches(self.exit_hotkey_config)
         
-    def _is_relevant_key(self, key_name: str) -> bool:
+    def _is_relevant_vk(self, vk: int) -> bool:
         """判断是否是相关按键（用于减少日志噪音）"""
-        # 只关注热键相关的按键
-        relevant_keys = {
-            self.hotkey_config['key'],
-            self.exit_hotkey_config['key'],
-            'ctrl_l', 'ctrl_r', 'ctrl',
-            'shift_l', 'shift_r', 'shift', 
-            'alt_l', 'alt_r', 'alt',
-            'cmd_l', 'cmd_r', 'cmd',
-            'esc'  # 退出键
-        }
-        
-        if self.hotkey_config['modifier']:
-            relevant_keys.add(self.hotkey_config['modifier'])
-            
-        if self.exit_hotkey_config['modifier']:
-            relevant_keys.add(self.exit_hotkey_config['modifier'])
-            
-        return key_name in relevant_keys
+        # 只关注热键主键、所有修饰键和Esc
+        if vk == self.hotkey_config.get('_key_vk') or vk == self.exit_hotkey_config.get('_key_vk'):
+            return True
+        if vk == 0x1B:  # esc
+            return True
+        for mod_vks in _MODIFIER_VKS.values():
+            if vk in mod_vks:
+                return True
+        return False
         
+    def _submit_callback(self, callback: Callable):
+        """把回调交给常驻分发线程执行（监听回调立即返回）"""
+        if self._dispatch is None:
+            self._dispatch = ThreadPoolExecutor(max_workers=1,
+                                                thread_name_prefix='hotkey')
+        self._dispatch.submit(callback)
+
     def _trigger_hotkey(self):
         """触发热键回调"""
         if self.callback:
             try:
                 logger.info(f"热键被触发: {self._get_hotkey_description()}")
-                # 在新线程中执行回调，避免阻塞监听器
-                thread = threading.Thread(target=self.callback)
-                thread.daemon = True
-                thread.start()
+                self._submit_callback(self.callback)
             except Exception as e:
                 logger.error(f"执行热键回调时发生错误: {e}")
-                
+
     def _trigger_exit_hotkey(self):
         """触发退出热键回调"""
         if self.exit_callback:
             try:
                 logger.info("程序即将退出...")
-                # 在新线程中执行回调，避免阻塞监听器
-                thread = threading.Thread(target=self.exit_callback)
-                thread.daemon = True
-                thread.start()
+                self._submit_callback(self.exit_callback)
             except Exception as e:
                 logger.error(f"执行退出热键回调时发生错误: {e}")
                 
     def get_pressed_keys(self) -> set:
-        """获取当前按下的按键"""
-        return self.pressed_keys.copy()
-        
+        """获取当前按下的按键（键名集合）"""
+        return {_VK_TO_NAME.get(vk, str(vk)) for vk in self.pressed_vks}
+
     def is_key_pressed(self, key: str) -> bool:
         """检查指定按键是否被按下"""
-        return key.lower() in self.pressed_keys
+        vk = _win_hotkeys.VK_CODES.get(key.lower())
+        return vk is not None and vk in self.pressed_vks
+
+
+class HotkeyEntry:
+    """单条热键配置
+
+    槽位类：热路径上的属性访问是C级偏移量读取，
+    没有dict哈希探查，内存布局固定
+    """
+
+    __slots__ = ('key', 'modifier', 'press_type', 'callback', 'key_vk', 'mod_vks')
+
+    def __init__(self, key: str, modifier: Optional[str] = None,
+                 press_type: str = 'press', callback: Optional[Callable] = None):
+        self.key = key.lower()
+        self.modifier = modifier.lower() if modifier else None
+        self.press_type = press_type
+        self.callback = callback
+        self.key_vk = _win_hotkeys.VK_CODES.get(self.key, -1)
+        self.mod_vks = _MODIFIER_VKS.get(self.modifier, frozenset()) if self.modifier else None
+
+    def matches(self, pressed_vks: set) -> bool:
+        """当前按键状态是否命中该热键"""
+        if self.key_vk not in pressed_vks:
+            return False
+        return self.mod_vks is None or not self.mod_vks.isdisjoint(pressed_vks)
+
+    def description(self) -> str:
+        """可读描述，如CTRL + F12"""
+        desc = ""
+        if self.modifier:
+            desc += f"{self.modifier.upper()} + "
+        return desc + self.key.upper()
 
 
 class AdvancedHotkeyManager(HotkeyManager):
@@ -312,39 +421,23 @@ class AdvancedHotkeyManager(HotkeyManager):
         
         # 多热键配置
         self.hotkey_configs = {
-            'start_recording': {
-                'key': 'f9',
-                'modifier': None,
-                'press_type': 'press',
-                'callback': None
-            },
-            'stop_recording': {
-                'key': 'f10',
-                'modifier': None,
-                'press_type': 'press',
-                'callback': None
-            },
-            'toggle_recording': {
-                'key': 'f11',
-                'modifier': None,
-                'press_type': 'press',
-                'callback': None
-            },
-            'show_window': {
-                'key': 'f12',
-                'modifier': 'ctrl',
-                'press_type': 'press',
-                'callback': None
-            }
+            'start_recording': HotkeyEntry('f9'),
+            'stop_recording': HotkeyEntry('f10'),
+            'toggle_recording': HotkeyEntry('f11'),
+            'show_window': HotkeyEntry('f12', modifier='ctrl'),
         }
-        
+
         # 组合键状态
         self.combo_states = {}
+
+        # 主键倒排索引：key_vk -> [(name, config)]，按键事件只探查相关配置
+        self._by_primary = {}
+        self._rebuild_primary_index()
         
     def set_hotkey_callback(self, name: str, callback: Callable):
         """设置指定热键的回调函数"""
         if name in self.hotkey_configs:
-            self.hotkey_configs[name]['callback'] = callback
+            self.hotkey_configs[name].callback = callback
             logger.info(f"热键 {name} 的回调函数已设置")
         else:
             logger.warning(f"未找到热键配置: {name}")
@@ -352,51 +445,69 @@ class AdvancedHotkeyManager(HotkeyManager):
     def add_hotkey(self, name: str, key: str, modifier: Optional[str] = None, 
                    press_type: str = 'press', callback: Optional[Callable] = None):
         """添加热键配置"""
-        self.hotkey_configs[name] = {
-            'key': key.lower(),
-            'modifier': modifier.lower() if modifier else None,
-            'press_type': press_type,
-            'callback': callback
-        }
-        
+        self.hotkey_configs[name] = HotkeyEntry(key, modifier, press_type, callback)
+
+        self._rebuild_primary_index()
         logger.info(f"已添加热键 {name}: {self._get_hotkey_description_for_config(name)}")
-        
+
     def remove_hotkey(self, name: str):
         """移除热键配置"""
         if name in self.hotkey_configs:
             del self.hotkey_configs[name]
+            self._rebuild_primary_index()
             logger.info(f"已移除热键: {name}")
         else:
             logger.warning(f"未找到热键配置: {name}")
+
+    def _hotkey_configs_for_filter(self) -> list:
+        """参与VK过滤的热键配置列表（覆盖多热键配置）"""
+        return list(self.hotkey_configs.values())
+
+    def _rebuild_primary_index(self):
+        """重建主键倒排索引"""
+        index = {}
+        for name, entry in self.hotkey_configs.items():
+            index.setdefault(entry.key_vk, []).append((name, entry))
+        self._by_primary = index
             
     def _get_hotkey_description_for_config(self, name: str) -> str:
         """获取指定热键配置的描述"""
         if name not in self.hotkey_configs:
             return ""
             
-        config = self.hotkey_configs[name]
-        desc = ""
-        if config['modifier']:
-            desc += f"{config['modifier'].upper()} + "
-        desc += config['key'].upper()
-        return desc
+        return self.hotkey_configs[name].description()
         
+    def _native_registrations(self) -> Optional[list]:
+        """构造RegisterHotKey注册表（覆盖多热键配置）"""
+        registrations = []
+        for name, entry in self.hotkey_configs.items():
+            if entry.press_type != 'press':
+                return None
+            resolved = _win_hotkeys.resolve(entry.key, entry.modifier)
+            if resolved is None:
+                return None
+            mods, vk = resolved
+            registrations.append(
+                (mods, vk,
+                 lambda n=name, e=entry: self._trigger_hotkey_for_config(n, e)))
+        return registrations
+
     def _on_key_press(self, key):
         """按键按下事件（重写）"""
         try:
-            # 获取按键名称
-            key_name = self._get_key_name(key)
-            if key_name:
-                self.pressed_keys.add(key_name)
-                
-                # 检查所有热键配置
-                for name, config in self.hotkey_configs.items():
-                    if self._is_hotkey_match_for_config(config):
-                        if name not in self.combo_states or not self.combo_states[name]:
+            # 获取虚拟键码
+            vk = _vk_of(key)
+            if vk is not None:
+                self.pressed_vks.add(vk)
+
+                # 倒排索引：只探查以该键为主键的配置（哈希命中代替线性扫描）
+                for name, entry in self._by_primary.get(vk, ()):
+                    if entry.matches(self.pressed_vks):
+                        if not self.combo_states.get(name):
                             self.combo_states[name] = True
-                            
-                            if config['press_type'] == 'press':
-                                self._trigger_hotkey_for_config(name, config)
+
+                            if entry.press_type == 'press':
+                                self._trigger_hotkey_for_config(name, entry)
                                 
         except Exception as e:
             logger.error(f"处理按键按下事件时发生错误: {e}")
@@ -404,63 +515,35 @@ class AdvancedHotkeyManager(HotkeyManager):
     def _on_key_release(self, key):
         """按键释放事件（重写）"""
         try:
-            # 获取按键名称
-            key_name = self._get_key_name(key)
-            if key_name:
-                self.pressed_keys.discard(key_name)
-                
-                # 检查所有热键配置
-                for name, config in self.hotkey_configs.items():
-                    if name in self.combo_states and self.combo_states[name]:
-                        if not self._is_hotkey_match_for_config(config):
+            # 获取虚拟键码
+            vk = _vk_of(key)
+            if vk is not None:
+                self.pressed_vks.discard(vk)
+
+                # 只检查当前处于按下状态的组合
+                for name, active in self.combo_states.items():
+                    if active:
+                        entry = self.hotkey_configs.get(name)
+                        if entry and not entry.matches(self.pressed_vks):
                             self.combo_states[name] = False
-                            
-                            if config['press_type'] == 'release':
-                                self._trigger_hotkey_for_config(name, config)
+
+                            if entry.press_type == 'release':
+                                self._trigger_hotkey_for_config(name, entry)
                                 
         except Exception as e:
             logger.error(f"处理按键释放事件时发生错误: {e}")
             
-    def _is_hotkey_match_for_config(self, config: dict) -> bool:
+    def _is_hotkey_match_for_config(self, entry: 'HotkeyEntry') -> bool:
         """检查当前按键是否匹配指定热键配置"""
-        target_key = config['key']
-        target_modifier = config['modifier']
-        
-        # 检查主键
-        if target_key not in self.pressed_keys:
-            return False
-            
-        # 检查修饰键
-        if target_modifier:
-            modifier_keys = {
-                'ctrl': ['ctrl_l', 'ctrl_r', 'ctrl'],
-                'shift': ['shift_l', 'shift_r', 'shift'],
-                'alt': ['alt_l', 'alt_r', 'alt'],
-                'cmd': ['cmd_l', 'cmd_r', 'cmd'],
-                'win': ['cmd_l', 'cmd_r', 'cmd']
-            }
-            
-            modifier_pressed = False
-            for mod_key in modifier_keys.get(target_modifier, []):
-                if mod_key in self.pressed_keys:
-                    modifier_pressed = True
-                    break
-                    
-            if not modifier_pressed:
-                return False
-                
-        return True
-        
-    def _trigger_hotkey_for_config(self, name: str, config: dict):
+        return entry.matches(self.pressed_vks)
+
+    def _trigger_hotkey_for_config(self, name: str, entry: 'HotkeyEntry'):
         """触发指定热键配置的回调"""
-        callback = config.get('callback')
+        callback = entry.callback
         if callback:
             try:
                 logger.info(f"热键被触发: {name} - {self._get_hotkey_description_for_config(name)}")
-                # 在新线程中执行回调，避免阻塞监听器
-                thread = threading.Thread(target=callback)
-                thread.daemon = True
-                thread.start()
+                self._submit_callback(callback)
             except Exception as e:
                 logger.error(f"执行热键回调时发生错误: {e}")
                 
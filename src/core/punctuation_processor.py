@@ -4,86 +4,161 @@
 """
 
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from loguru import logger
 
+try:
+    import ahocorasick  # pyahocorasick，可选加速
+except ImportError:
+    ahocorasick = None
+
 
 class PunctuationProcessor:
     """标点符号处理器"""
-    
+
+    # 字符级清理用translate表（C层单遍扫描，比字符类正则快）
+    _STRIP_TABLE = str.maketrans('', '', '，。！？；：')
+
+    # 逗号+句末标点的修正仍需正则（含捕获组）
+    _COMMA_BEFORE_END = re.compile(r'，([。！？])')
+
+    # 疑问/感叹句标志：各合并为单个交替正则，一次C层扫描
+    _QUESTION_PATTERN = re.compile(r'什么|哪里|怎么|为什么|吗|呢|是否')
+    _EXCLAMATION_PATTERN = re.compile(r'太|真|好棒|厉害|赞|哇')
+
+    # 停顿词和语气词（命中后补逗号）
+    _PAUSE_WORDS = (
+        '然后', '接着', '之后', '后来',
+        '但是', '不过', '可是', '只是',
+        '因为', '由于', '所以', '因此',
+        '如果', '要是', '假如', '倘若',
+        '虽然', '尽管', '即使', '哪怕',
+        '而且', '并且', '同时', '另外',
+        '首先', '其次', '最后', '最终',
+        '当然', '显然', '确实', '的确',
+    )
+
+    # 句子结束标志，按优先级排列（先命中的规则决定句末标点）
+    _END_RULES = (
+        (('完了', '好了', '结束了', '就这样'), '。'),
+        (('怎么样', '如何', '行吗', '可以吗'), '？'),
+        (('真的', '太好了', '太棒了', '很棒'), '！'),
+        (('谢谢', '感谢', '再见', '拜拜'), '。'),
+    )
+
     def __init__(self):
-        # 停顿词和语气词规则
-        self.pause_patterns = [
-            (r'然后|接着|之后|后来', '，'),
-            (r'但是|不过|可是|只是', '，'),
-            (r'因为|由于|所以|因此', '，'),
-            (r'如果|要是|假如|倘若', '，'),
-            (r'虽然|尽管|即使|哪怕', '，'),
-            (r'而且|并且|同时|另外', '，'),
-            (r'首先|其次|最后|最终', '，'),
-            (r'当然|显然|确实|的确', '，'),
-        ]
-        
-        # 句子结束标志
+        # 首选Aho-Corasick自动机：停顿词和句末标志全部词条
+        # 一遍线性扫描出结果，匹配在C层完成
+        if ahocorasick is not None:
+            self._aho = ahocorasick.Automaton()
+            for word in self._PAUSE_WORDS:
+                self._aho.add_word(word, ('pause', 0))
+            for priority, (words, _punct) in enumerate(self._END_RULES):
+                for word in words:
+                    self._aho.add_word(word, ('end', priority))
+            self._aho.make_automaton()
+        else:
+            self._aho = None
+
+        # 退路：合并成单个交替正则，一次扫描完成全部替换
+        self.pause_pattern = re.compile(
+            '(' + '|'.join(self._PAUSE_WORDS) + ')'
+        )
+
         self.sentence_end_patterns = [
-            (r'完了|好了|结束了|就这样', '。'),
-            (r'怎么样|如何|行吗|可以吗', '？'),
-            (r'真的|太好了|太棒了|很棒', '！'),
-            (r'谢谢|感谢|再见|拜拜', '。'),
+            (re.compile('|'.join(words)), punct)
+            for words, punct in self._END_RULES
         ]
-        
+
         # 数字相关规则
         self.number_patterns = [
-            (r'第(\d+)', r'第\1'),
-            (r'(\d+)年(\d+)月', r'\1年\2月'),
-            (r'(\d+)点(\d+)分', r'\1点\2分'),
+            (re.compile(r'第(\d+)'), r'第\1'),
+            (re.compile(r'(\d+)年(\d+)月'), r'\1年\2月'),
+            (re.compile(r'(\d+)点(\d+)分'), r'\1点\2分'),
         ]
-    
+
     def process(self, text: str) -> str:
         """处理文本，添加标点符号"""
         if not text or not text.strip():
             return text
-            
+
         try:
             # 清理原始文本
             text = text.strip()
-            
+
+            # 快路径：已经带合理标点的文本（有句末标点且句中有逗号）
+            # 直接原样返回，跳过整个重建流程
+            if text and text[-1] in '。！？' and '，' in text[:-1]:
+                return text
+
             # 移除已有的标点符号（如果有）
-            text = re.sub(r'[，。！？；：]', '', text)
-            
-            # 应用停顿规则
-            for pattern, punctuation in self.pause_patterns:
-                text = re.sub(f'({pattern})', rf'\1{punctuation}', text)
-            
+            text = text.translate(self._STRIP_TABLE)
+
+            # 应用停顿规则并检测句末标志（自动机路径单遍完成）
+            if self._aho is not None:
+                text, end_punct = self._scan_automaton(text)
+            else:
+                text = self.pause_pattern.sub(r'\1，', text)
+                end_punct = None
+
             # 处理数字格式
             for pattern, replacement in self.number_patterns:
-                text = re.sub(pattern, replacement, text)
-            
+                text = pattern.sub(replacement, text)
+
             # 智能断句
             text = self._smart_sentence_break(text)
-            
+
             # 应用句末规则
-            for pattern, punctuation in self.sentence_end_patterns:
-                if re.search(pattern, text):
-                    if not text.endswith(('。', '！', '？')):
-                        text += punctuation
-                    break
-            
+            if end_punct is not None:
+                if not text.endswith(('。', '！', '？')):
+                    text += end_punct
+            elif self._aho is None:
+                for pattern, punctuation in self.sentence_end_patterns:
+                    if pattern.search(text):
+                        if not text.endswith(('。', '！', '？')):
+                            text += punctuation
+                        break
+
             # 如果没有句末标点，根据长度和内容判断
             if not text.endswith(('。', '！', '？', '，')):
                 text = self._add_final_punctuation(text)
-            
-            # 清理多余的逗号
-            text = re.sub(r'，+', '，', text)
-            text = re.sub(r'，([。！？])', r'\1', text)
-            
-            logger.debug(f"标点处理: {text}")
+
+            # 清理多余的逗号（短文本上str.replace循环快于正则）
+            while '，，' in text:
+                text = text.replace('，，', '，')
+            text = self._COMMA_BEFORE_END.sub(r'\1', text)
+
+            logger.debug("标点处理: {}", text)
             return text
-            
+
         except Exception as e:
             logger.error(f"标点符号处理失败: {e}")
             return text
-    
+
+    def _scan_automaton(self, text: str) -> Tuple[str, Optional[str]]:
+        """单遍自动机扫描：收集停顿词插逗号位置，并判定句末标点"""
+        insert_positions = []
+        end_priority = None
+        for end_idx, (kind, priority) in self._aho.iter(text):
+            if kind == 'pause':
+                insert_positions.append(end_idx + 1)
+            elif end_priority is None or priority < end_priority:
+                end_priority = priority
+
+        if insert_positions:
+            # iter按结束位置递增返回，无需排序
+            parts = []
+            last = 0
+            for pos in insert_positions:
+                parts.append(text[last:pos])
+                parts.append('，')
+                last = pos
+            parts.append(text[last:])
+            text = ''.join(parts)
+
+        punct = None if end_priority is None else self._END_RULES[end_priority][1]
+        return text, punct
+
     def _smart_sentence_break(self, text: str) -> str:
         """智能断句"""
         # 如果文本很长，在适当位置添加逗号
@@ -94,24 +169,22 @@ class PunctuationProcessor:
                 if point in text:
                     text = text.replace(point, f'{point}，', 1)
                     break
-        
+
         return text
-    
+
     def _add_final_punctuation(self, text: str) -> str:
         """根据内容添加句末标点"""
         # 疑问句标志
-        question_words = ['什么', '哪里', '怎么', '为什么', '吗', '呢', '是否']
-        if any(word in text for word in question_words):
+        if self._QUESTION_PATTERN.search(text):
             return text + '？'
-        
-        # 感叹句标志  
-        exclamation_words = ['太', '真', '好棒', '厉害', '赞', '哇']
-        if any(word in text for word in exclamation_words):
+
+        # 感叹句标志
+        if self._EXCLAMATION_PATTERN.search(text):
             return text + '！'
-        
+
         # 默认添加句号
         return text + '。'
 
 
 # 全局实例
-punctuation_processor = PunctuationProcessor() 
\ No newline at end of file
+punctuation_processor = PunctuationProcessor()
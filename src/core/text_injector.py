@@ -4,26 +4,108 @@
 """
 
 import time
+import ctypes
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-import pyautogui
-import win32api
 import win32con
 import win32gui
 import win32process
 import win32clipboard
 from loguru import logger
-import psutil
+
+# pyautogui和psutil按需导入：pyautogui连带PIL/pyscreeze约30MB，
+# psutil带原生扩展，都不该出现在冷启动路径上
+_pyautogui = None
+
+
+def _get_pyautogui():
+    """首次使用时才导入并配置pyautogui"""
+    global _pyautogui
+    if _pyautogui is None:
+        import pyautogui
+        pyautogui.FAILSAFE = False  # 禁用安全机制，避免意外触发
+        pyautogui.PAUSE = 0.05  # 减少延迟提升响应速度
+        _pyautogui = pyautogui
+    return _pyautogui
+
+
+# SendInput所需的Win32结构体（KEYEVENTF_UNICODE直接注入UTF-16码元，
+# 与键盘布局无关，一次系统调用发送整串文本）
+_KEYEVENTF_UNICODE = 0x0004
+_KEYEVENTF_KEYUP = 0x0002
+_INPUT_KEYBOARD = 1
+
+_ULONG_PTR = ctypes.POINTER(ctypes.c_ulong)
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ('wVk', ctypes.c_ushort),
+        ('wScan', ctypes.c_ushort),
+        ('dwFlags', ctypes.c_ulong),
+        ('time', ctypes.c_ulong),
+        ('dwExtraInfo', _ULONG_PTR),
+    ]
+
+
+class _INPUT_UNION(ctypes.Union):
+    _fields_ = [
+        ('ki', _KEYBDINPUT),
+        ('padding', ctypes.c_ubyte * 32),
+    ]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_ulong),
+        ('union', _INPUT_UNION),
+    ]
+
+
+def _send_unicode_input(text: str):
+    """用单次SendInput注入整串文本（UTF-16码元按下+抬起事件对）"""
+    units = text.encode('utf-16-le')
+    n_units = len(units) // 2
+    arr = (_INPUT * (2 * n_units))()
+    for i in range(n_units):
+        code = units[2 * i] | (units[2 * i + 1] << 8)
+        down = arr[2 * i]
+        down.type = _INPUT_KEYBOARD
+        down.union.ki.wScan = code
+        down.union.ki.dwFlags = _KEYEVENTF_UNICODE
+        up = arr[2 * i + 1]
+        up.type = _INPUT_KEYBOARD
+        up.union.ki.wScan = code
+        up.union.ki.dwFlags = _KEYEVENTF_UNICODE | _KEYEVENTF_KEYUP
+    sent = ctypes.windll.user32.SendInput(len(arr), arr, ctypes.sizeof(_INPUT))
+    if sent != len(arr):
+        raise OSError(f"SendInput只发送了 {sent}/{len(arr)} 个事件")
+
+
+def _send_paste():
+    """单次SendInput发送Ctrl+V（4个事件一次注入，无逐键延迟）"""
+    vk_control = 0x11
+    vk_v = 0x56
+    arr = (_INPUT * 4)()
+    for i, (vk, flags) in enumerate((
+        (vk_control, 0),
+        (vk_v, 0),
+        (vk_v, _KEYEVENTF_KEYUP),
+        (vk_control, _KEYEVENTF_KEYUP),
+    )):
+        arr[i].type = _INPUT_KEYBOARD
+        arr[i].union.ki.wVk = vk
+        arr[i].union.ki.dwFlags = flags
+    sent = ctypes.windll.user32.SendInput(4, arr, ctypes.sizeof(_INPUT))
+    if sent != 4:
+        raise OSError(f"SendInput只发送了 {sent}/4 个事件")
 
 
 class TextInjector:
     """文字输入器"""
     
     def __init__(self):
-        # 设置pyautogui参数
-        pyautogui.FAILSAFE = False  # 禁用安全机制，避免意外触发
-        pyautogui.PAUSE = 0.05  # 减少延迟提升响应速度
-        
         # 输入方式配置
         self.input_methods = {
             'clipboard': self._inject_via_clipboard,
@@ -33,12 +115,61 @@ class TextInjector:
         
         # 默认输入方式
         self.default_method = 'clipboard'
-        
+
+        # 活动窗口进程名缓存：hwnd -> (pid, process_name)
+        # 连续向同一应用听写时省掉每次的psutil.Process句柄开销
+        self._win_cache = {}
+        self._win_cache_order = []
+
+        # 上次注入的目标窗口和时间：同一窗口连续注入时免去预热延迟
+        self._last_hwnd = None
+        self._last_inject_ts = 0.0
+
+        # 合并窗口内的待注入文本：连续到达的识别结果拼成一次注入，
+        # 摊薄剪贴板备份/粘贴/恢复的固定开销
+        self._pending = []
+        self._pending_method = None
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+
+        # 注入专用单线程：所有实际注入串行执行，注入里的睡眠
+        # （预热/剪贴板恢复）不会阻塞定时器线程，也不会互相交错
+        # 抢剪贴板
+        self._inject_executor: Optional[ThreadPoolExecutor] = None
+
+    _WIN_CACHE_SIZE = 16
+    _COALESCE_WINDOW = 0.05  # 秒，合并连续识别结果的去抖窗口
+
     def inject_text(self, text: str, method: Optional[str] = None):
-        """输入文字到当前光标位置"""
+        """输入文字到当前光标位置（短时间内的连续调用合并为一次注入）"""
         if not text.strip():
             return
-            
+
+        with self._pending_lock:
+            self._pending.append(text)
+            self._pending_method = method
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(
+                self._COALESCE_WINDOW, self._flush_pending)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_pending(self):
+        """把合并窗口内积累的文本一次性注入"""
+        with self._pending_lock:
+            text = ''.join(self._pending)
+            method = self._pending_method
+            self._pending.clear()
+            self._flush_timer = None
+        if text:
+            if self._inject_executor is None:
+                self._inject_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='inject')
+            self._inject_executor.submit(self._do_inject, text, method)
+
+    def _do_inject(self, text: str, method: Optional[str] = None):
+        """执行实际的注入流程"""
         method = method or self.default_method
         
         try:
@@ -47,10 +178,16 @@ class TextInjector:
             # 获取当前活动窗口信息
             active_window = self._get_active_window_info()
             logger.info(f"当前活动窗口: {active_window}")
-            
-            # 添加短暂延迟，避免与系统操作冲突
-            time.sleep(0.1)
-            
+
+            # 仅在目标窗口变化或久未注入时短暂等待；
+            # 同一窗口连续听写不需要预热延迟
+            hwnd = active_window.get('hwnd')
+            now = time.monotonic()
+            if hwnd != self._last_hwnd or now - self._last_inject_ts >= 2.0:
+                time.sleep(0.1)
+            self._last_hwnd = hwnd
+            self._last_inject_ts = now
+
             # 选择合适的输入方法
             if method in self.input_methods:
                 self.input_methods[method](text)
@@ -73,14 +210,28 @@ class TextInjector:
             
             # 获取窗口所属进程
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            process_name = ""
-            
-            try:
-                process = psutil.Process(pid)
-                process_name = process.name()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-                
+
+            # 命中缓存且pid未变（窗口没被复用）时跳过psutil查询
+            cached = self._win_cache.get(hwnd)
+            if cached is not None and cached[0] == pid:
+                process_name = cached[1]
+            else:
+                process_name = ""
+                try:
+                    import psutil
+                    process = psutil.Process(pid)
+                    process_name = process.name()
+                except Exception:
+                    pass
+
+                self._win_cache[hwnd] = (pid, process_name)
+                if hwnd in self._win_cache_order:
+                    self._win_cache_order.remove(hwnd)
+                self._win_cache_order.append(hwnd)
+                if len(self._win_cache_order) > self._WIN_CACHE_SIZE:
+                    evicted = self._win_cache_order.pop(0)
+                    self._win_cache.pop(evicted, None)
+
             return {
                 'hwnd': hwnd,
                 'title': window_title,
@@ -95,32 +246,43 @@ class TextInjector:
     def _inject_via_clipboard(self, text: str):
         """通过剪贴板输入文字"""
         try:
-            # 备份当前剪贴板内容
-            backup_text = self._get_clipboard_text()
-            
-            # 将文字复制到剪贴板
-            self._set_clipboard_text(text)
-            
-            # 短暂延迟确保剪贴板内容已更新
-            time.sleep(0.1)
-            
-            # 发送Ctrl+V粘贴
-            pyautogui.hotkey('ctrl', 'v')
-            
+            # 一次open/close内完成备份+写入；CloseClipboard返回即生效，
+            # 无需等待剪贴板更新
+            backup_text = self._swap_clipboard(text)
+
+            # 发送Ctrl+V粘贴（单次SendInput，免去pyautogui逐键PAUSE）
+            _send_paste()
+
             # 短暂延迟后恢复剪贴板内容
-            time.sleep(0.2)
+            time.sleep(0.15)
             if backup_text is not None:
-                self._set_clipboard_text(backup_text)
-                
+                self._swap_clipboard(backup_text)
+
         except Exception as e:
             logger.error(f"剪贴板输入方式失败: {e}")
             raise
+
+    def _swap_clipboard(self, new_text: str) -> Optional[str]:
+        """单次打开剪贴板，读出旧内容并写入新内容"""
+        old_text = None
+        win32clipboard.OpenClipboard()
+        try:
+            if win32clipboard.IsClipboardFormatAvailable(win32con.CF_UNICODETEXT):
+                old_text = win32clipboard.GetClipboardData(win32con.CF_UNICODETEXT)
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardText(new_text, win32con.CF_UNICODETEXT)
+        finally:
+            try:
+                win32clipboard.CloseClipboard()
+            except:
+                pass
+        return old_text
             
     def _inject_via_typing(self, text: str):
         """通过模拟键盘输入文字"""
         try:
             # 直接输入文字
-            pyautogui.write(text, interval=0.01)
+            _get_pyautogui().write(text, interval=0.01)
             
         except Exception as e:
             logger.error(f"键盘输入方式失败: {e}")
@@ -129,17 +291,10 @@ class TextInjector:
     def _inject_via_sendkeys(self, text: str):
         """通过SendKeys输入文字"""
         try:
-            # 使用Windows API发送字符
-            for char in text:
-                # 获取虚拟键码
-                vk_code = win32api.VkKeyScan(char)
-                
-                if vk_code != -1:
-                    # 发送按键按下和释放事件
-                    win32api.keybd_event(vk_code & 0xFF, 0, 0, 0)
-                    win32api.keybd_event(vk_code & 0xFF, 0, win32con.KEYEVENTF_KEYUP, 0)
-                    time.sleep(0.01)
-                    
+            # 单次SendInput发送Unicode事件数组：
+            # 与布局无关（中文也能发），无逐字符sleep
+            _send_unicode_input(text)
+
         except Exception as e:
             logger.error(f"SendKeys输入方式失败: {e}")
             raise
@@ -151,17 +306,26 @@ class TextInjector:
             
             # 按优先级尝试不同的输入方法
             backup_methods = ['sendkeys', 'typing', 'clipboard']
-            
+
+            # 自适应退避：首次几乎立刻重试，连续失败才逐级加长等待
+            delay = 0.005
+            start_hwnd = win32gui.GetForegroundWindow()
+
             for method_name in backup_methods:
                 if method_name != self.default_method and method_name in self.input_methods:
+                    # 用户已切走窗口时停止重试，别把文字注到别的窗口里
+                    if win32gui.GetForegroundWindow() != start_hwnd:
+                        logger.warning("目标窗口已切换，停止备用注入")
+                        return
                     try:
                         logger.info(f"尝试备用方法: {method_name}")
-                        time.sleep(0.2)  # 额外延迟确保系统准备就绪
+                        time.sleep(delay)
                         self.input_methods[method_name](text)
                         logger.info(f"✅ 备用方法 {method_name} 成功")
                         return
                     except Exception as e:
                         logger.warning(f"❌ 备用方法 {method_name} 失败: {e}")
+                        delay = min(delay * 4, 0.2)
                         continue
                         
             logger.error("❌ 所有输入方法都失败了")
@@ -249,8 +413,8 @@ class SmartTextInjector(TextInjector):
             }
         }
         
-    def inject_text(self, text: str, method: Optional[str] = None):
-        """智能输入文字"""
+    def _do_inject(self, text: str, method: Optional[str] = None):
+        """智能输入文字（在合并刷新点执行，前后置动作贴着实际注入）"""
         # 获取当前活动窗口
         window_info = self._get_active_window_info()
         process_name = window_info.get('process_name', '').lower()
@@ -271,7 +435,7 @@ class SmartTextInjector(TextInjector):
                 logger.warning(f"前置动作执行失败: {e}")
                 
         # 执行文字输入
-        super().inject_text(text, method)
+        super()._do_inject(text, method)
         
         # 执行后置动作
         post_action = app_config.get('post_action')
@@ -284,13 +448,13 @@ class SmartTextInjector(TextInjector):
     def _excel_pre_action(self):
         """Excel前置动作"""
         # 确保单元格处于编辑状态
-        pyautogui.press('f2')
+        _get_pyautogui().press('f2')
         time.sleep(0.1)
         
     def _excel_post_action(self):
         """Excel后置动作"""
         # 按Enter确认输入
-        pyautogui.press('enter')
+        _get_pyautogui().press('enter')
         
     def _wechat_post_action(self):
         """微信后置动作"""
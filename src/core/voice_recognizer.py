@@ -3,6 +3,7 @@
 支持Whisper本地识别和大模型优化
 """
 
+import contextlib
 import threading
 import time
 import numpy as np
@@ -11,16 +12,23 @@ import whisper
 from typing import Callable, Optional
 from loguru import logger
 from pathlib import Path
-import tempfile
-import wave
+import hashlib
 import os
-from collections import deque
+from collections import OrderedDict
 
 try:
-    import scipy.signal
-    SCIPY_AVAILABLE = True
+    # CTranslate2量化推理后端，CPU上比openai-whisper快数倍
+    from faster_whisper import WhisperModel as FasterWhisperModel
+    FASTER_WHISPER_AVAILABLE = True
 except ImportError:
-    SCIPY_AVAILABLE = False
+    FASTER_WHISPER_AVAILABLE = False
+
+try:
+    # whisper.cpp绑定：GGML量化+手写SIMD内核，纯CPU机器的备选后端
+    from pywhispercpp.model import Model as WhisperCppModel
+    PYWHISPERCPP_AVAILABLE = True
+except ImportError:
+    PYWHISPERCPP_AVAILABLE = False
 
 try:
     import openai
@@ -28,6 +36,64 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(fastmath=True, cache=True)
+    def _preprocess_kernel(x):
+        """融合的预处理内核：去直流+统计+归一化，两遍内存访问完成
+
+        第一遍一次累出和、平方和、峰值边界（RMS用E[x²]-mean²恒等式
+        从同一遍得出），第二遍原地写回归一化结果；numba把标量循环
+        向量化成SIMD，省掉numpy逐操作的中间数组和多次全量遍历。
+        返回(rms, 峰值)供调用方记日志。
+        """
+        n = x.size
+        total = 0.0
+        sq = 0.0
+        lo = x[0]
+        hi = x[0]
+        for i in range(n):
+            v = x[i]
+            total += v
+            sq += v * v
+            if v < lo:
+                lo = v
+            elif v > hi:
+                hi = v
+        mean = total / n
+        var = sq / n - mean * mean
+        rms = var ** 0.5 if var > 0.0 else 0.0
+        amax = max(abs(lo - mean), abs(hi - mean))
+
+        scale = (0.6 / amax) if amax > 0 else 1.0
+        for i in range(n):
+            x[i] = (x[i] - mean) * scale
+        return rms, amax
+
+    @njit(nogil=True, fastmath=True, cache=True)
+    def _monitor_kernel(chunk, ring, w):
+        """监听回调的合并内核：RMS累加+环形缓冲写入一趟完成
+
+        nogil让实时音频线程在整段计算期间释放GIL，不被主线程的
+        Python工作挡住；返回(能量, 新写指针)。
+        """
+        n = chunk.shape[0]
+        ring_len = ring.shape[0]
+        acc = 0.0
+        for i in range(n):
+            v = chunk[i]
+            acc += v * v
+            ring[w] = v
+            w += 1
+            if w == ring_len:
+                w = 0
+        return (acc / n) ** 0.5, w
+
 # 导入本地标点符号处理器
 try:
     from .punctuation_processor import punctuation_processor
@@ -35,6 +101,28 @@ try:
 except ImportError:
     LOCAL_PUNCTUATION_AVAILABLE = False
 
+# 大模型文本优化的系统提示词（模块级常量，不逐次重建）
+_LLM_SYSTEM_PROMPT = """你是一个专业的中文语音识别文本优化助手。请对用户的语音识别文本进行优化，包括：
+1. 纠正语音识别错误（同音字、近音字错误）
+2. 添加合适的标点符号
+3. 规范化表达（口语转书面语）
+4. 处理数字和专业术语
+5. 保持原意不变
+
+注意：
+- 优先考虑中文语境和习惯表达
+- 如果原文本过于模糊或错误，保持原样
+- 只返回优化后的文本，不要添加任何解释或标记"""
+
+# 系统消息对象同样只建一份，每次请求复用
+_LLM_SYS_MSG = {"role": "system", "content": _LLM_SYSTEM_PROMPT}
+
+# 进程内模型缓存：(后端, 模型名) -> 已加载的模型对象
+# 基础识别器和连续识别器先后构造时复用同一份权重，
+# 省掉二次磁盘读取和数百MB的重复驻留内存
+_MODEL_CACHE = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
 
 class VoiceRecognizer:
     """语音识别器"""
@@ -42,20 +130,54 @@ class VoiceRecognizer:
     def __init__(self, config):
         self.config = config
         self.model = None
+        self.faster_model = None
+        self.cpp_model = None
+        self.device = "cpu"  # load_model时按CUDA可用性更新
+        self.cpu_bf16 = False  # CPU上bfloat16 autocast的开关
         self.is_recording = False
         self.callback: Optional[Callable[[str], None]] = None
+        self.update_callback: Optional[Callable[[str], None]] = None
         self.recording_thread = None
+
+        # 大模型优化的后台线程池（惰性创建）：
+        # 识别结果立即上抛，优化不阻塞下一轮录音
+        self._llm_pool = None
         
+        # 配置快照：避免每句都走configparser的区段+键线性查找
+        # （连续识别器在reload_config时刷新）
+        self._llm_enabled = bool(self.config.get('llm_optimization', 'enabled', fallback=False))
+        self._record_duration = float(self.config.get('voice_recognition', 'duration', fallback=5))
+
         # 音频参数
         self.sample_rate = 16000
         self.channels = 1
         self.chunk_size = 1024
         self.max_recording_time = 30  # 最大录音时间（秒）
         
+        # OpenAI客户端缓存：连接池/TLS会话跨请求复用
+        self._openai_client = None
+        self._openai_client_key = None
+
+        # CUDA路径的mel复用缓冲：锁页暂存+常驻显存张量，
+        # 首次用到时按模型mel维度惰性创建
+        self._mel_pinned = None
+        self._mel_dev = None
+
+        # 语音指纹 -> 转写结果的LRU：重复的口头指令
+        # （如"打开浏览器"）直接命中，省掉整次Whisper前向
+        self._utt_cache = OrderedDict()
+
         # 音频设备配置
         self.input_device_id = None
         self._setup_audio_device()
         
+        # 预热numba内核：启动时付掉JIT编译成本，
+        # 首句识别不再额外卡几百毫秒
+        if NUMBA_AVAILABLE:
+            _preprocess_kernel(np.zeros(16, dtype=np.float32))
+            _monitor_kernel(np.zeros(16, dtype=np.float32),
+                            np.zeros(32, dtype=np.float32), 0)
+        
         # 初始化模型
         self.load_model()
         
@@ -118,6 +240,94 @@ class VoiceRecognizer:
             project_root = Path(__file__).parent.parent.parent
             models_dir = project_root / "models"
             models_dir.mkdir(exist_ok=True)
+
+            # 检测GPU：CUDA可用时编码器/解码器GEMM跑半精度
+            # （放在缓存查找之前：device/线程数/bf16是实例状态，
+            # 复用缓存模型的实例同样需要正确设置）
+            try:
+                import torch
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+                if self.device == "cuda":
+                    # Ampere+上允许TF32：FP32矩阵乘走tensor core，
+                    # 精度损失对ASR不可感知
+                    torch.backends.cuda.matmul.allow_tf32 = True
+                if self.device == "cpu":
+                    # 推理线程数压到核数一半：给录音回调和GUI线程
+                    # 留出核，避免算子内并行把整机吃满反而抖动
+                    torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+                    # AVX-512 BF16/AMX机器可以用配置打开bf16 autocast，
+                    # 矩阵乘带宽减半；旧CPU上软件模拟反而更慢，默认关
+                    self.cpu_bf16 = bool(self.config.get(
+                        'voice_recognition', 'cpu_bf16', fallback=False))
+            except ImportError:
+                self.device = "cpu"
+
+            # 先查进程内缓存，命中直接复用（键含device，
+            # CUDA模型不会被误配给cpu实例）
+            with _MODEL_CACHE_LOCK:
+                cached = _MODEL_CACHE.get(('faster', model_name, self.device))
+                if cached is not None:
+                    self.faster_model = cached
+                    logger.info(f"✅ 复用已加载的faster-whisper模型: {model_name}")
+                    return
+                cached = _MODEL_CACHE.get(('cpp', model_name, self.device))
+                if cached is not None:
+                    self.cpp_model = cached
+                    logger.info(f"✅ 复用已加载的whisper.cpp模型: {model_name}")
+                    return
+                cached = _MODEL_CACHE.get(('whisper', model_name, self.device))
+                if cached is not None:
+                    self.model = cached
+                    logger.info(f"✅ 复用已加载的Whisper模型: {model_name}")
+                    return
+
+            # 后端选择：auto按可用性自动挑，ggml强制走whisper.cpp
+            # （配合small-q5_1这类INT4/INT5量化模型名，medium以上
+            # 模型在纯CPU机器也能逼近实时）
+            backend = self.config.get('voice_recognition', 'backend', fallback='auto')
+
+            # 优先使用faster-whisper（CTranslate2量化内核），
+            # 同尺寸模型CPU转写延迟通常低3-5倍
+            if FASTER_WHISPER_AVAILABLE and backend != 'ggml':
+                try:
+                    # GPU上int8_float16吃满tensor core，CPU上纯int8
+                    compute_type = "int8_float16" if self.device == "cuda" else "int8"
+                    # 物理核数的一半做算子内并行最稳：超线程对int8
+                    # GEMM帮助有限，单句延迟场景也不需要多worker
+                    cpu_threads = max(1, (os.cpu_count() or 2) // 2)
+                    self.faster_model = FasterWhisperModel(
+                        model_name,
+                        device="auto",
+                        compute_type=compute_type,
+                        cpu_threads=cpu_threads,
+                        num_workers=1,
+                        download_root=str(models_dir)
+                    )
+                    with _MODEL_CACHE_LOCK:
+                        _MODEL_CACHE[('faster', model_name, self.device)] = self.faster_model
+                    logger.info(f"✅ faster-whisper模型加载成功: {model_name}")
+                    return
+                except Exception as e:
+                    logger.warning(f"faster-whisper加载失败，尝试其它后端: {e}")
+                    self.faster_model = None
+
+            # whisper.cpp：配置指定ggml后端时强制使用，
+            # 否则作为纯CPU机器的次选（GGML量化+AVX2/AVX-512手写
+            # 内核，仍比PyTorch后端快数倍）
+            if PYWHISPERCPP_AVAILABLE and (backend == 'ggml' or self.device == "cpu"):
+                try:
+                    self.cpp_model = WhisperCppModel(
+                        model_name,
+                        models_dir=str(models_dir),
+                        n_threads=max(1, (os.cpu_count() or 2) // 2)
+                    )
+                    with _MODEL_CACHE_LOCK:
+                        _MODEL_CACHE[('cpp', model_name, self.device)] = self.cpp_model
+                    logger.info(f"✅ whisper.cpp模型加载成功: {model_name}")
+                    return
+                except Exception as e:
+                    logger.warning(f"whisper.cpp加载失败，回退到openai-whisper: {e}")
+                    self.cpp_model = None
             
             # 设置WHISPER_CACHE_DIR环境变量（优先使用环境变量方式）
             os.environ['WHISPER_CACHE_DIR'] = str(models_dir)
@@ -150,16 +360,23 @@ class VoiceRecognizer:
                 model_instance = whisper.model.Whisper(dims)
                 model_instance.load_state_dict(checkpoint["model_state_dict"])
                 
-                # 设置为评估模式
+                # 设置为评估模式，GPU可用时搬上CUDA
                 model_instance.eval()
+                if self.device == "cuda":
+                    model_instance = model_instance.to(self.device)
                 self.model = model_instance
+                with _MODEL_CACHE_LOCK:
+                    _MODEL_CACHE[('whisper', model_name, self.device)] = self.model
                 
                 logger.info(f"✅ 本地Whisper模型加载成功: {model_name}")
             else:
                 logger.warning(f"⚠️ 模型文件不存在: {model_path}")
                 logger.info(f"正在下载Whisper模型: {model_name} (约800MB，请稍候...)")
                 # 使用download_root参数确保下载到指定目录
-                self.model = whisper.load_model(model_name, download_root=str(models_dir))
+                self.model = whisper.load_model(model_name, device=self.device,
+                                                download_root=str(models_dir))
+                with _MODEL_CACHE_LOCK:
+                    _MODEL_CACHE[('whisper', model_name, self.device)] = self.model
                 logger.info(f"✅ Whisper模型下载并加载成功: {model_name}")
                 logger.info(f"📁 模型已保存到: {models_dir}")
             
@@ -169,14 +386,71 @@ class VoiceRecognizer:
                 # 回退到标准方法
                 model_name = self.config.get('voice_recognition', 'model', fallback='tiny')
                 self.model = whisper.load_model(model_name)
+                with _MODEL_CACHE_LOCK:
+                    _MODEL_CACHE[('whisper', model_name, self.device)] = self.model
                 logger.info(f"✅ 使用标准方法加载模型成功: {model_name}")
             except Exception as e2:
                 logger.error(f"加载Whisper模型完全失败: {e2}")
                 raise
+
+        if self.model is not None:
+            self._maybe_compile_model()
+
+    def _maybe_compile_model(self):
+        """按配置对openai-whisper模型做torch.compile（默认关闭）
+
+        TorchInductor能融合LayerNorm/注意力/GELU拿到1.5-3倍解码
+        吞吐，但首次编译要几十秒且Windows CPU工具链支持参差，
+        所以做成voice_recognition.torch_compile显式开关。
+        """
+        if not self.config.get('voice_recognition', 'torch_compile', fallback=False):
+            return
+        try:
+            import torch
+            if not hasattr(torch, 'compile'):
+                return
+            logger.info("正在torch.compile编码器/解码器（首次较慢）...")
+            self.model.encoder = torch.compile(
+                self.model.encoder, mode='reduce-overhead', dynamic=False)
+            self.model.decoder = torch.compile(
+                self.model.decoder, mode='reduce-overhead', dynamic=False)
+            # 预热一次：编译成本在启动时付掉，不落在首句听写上
+            # （用弱噪声而不是全零，避免被静音早退拦在模型外）
+            warmup = (np.random.default_rng(0)
+                      .standard_normal(self.sample_rate)
+                      .astype(np.float32) * 0.01)
+            self._recognize_audio(warmup)
+            logger.info("✅ torch.compile预热完成")
+        except Exception as e:
+            logger.warning(f"torch.compile不可用，继续用即时模式: {e}")
             
     def set_callback(self, callback: Callable[[str], None]):
         """设置识别结果回调函数"""
         self.callback = callback
+
+    def set_update_callback(self, callback: Callable[[str], None]):
+        """设置大模型优化完成后的文本更新回调"""
+        self.update_callback = callback
+
+    def _submit_llm_optimization(self, text: str):
+        """把大模型优化排到后台线程池，完成后走更新回调"""
+        if self.update_callback is None:
+            # 结果无处投递时不发请求，不白白消耗API额度
+            logger.debug("未设置更新回调，跳过大模型优化")
+            return
+        if self._llm_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._llm_pool = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix='llm')
+        self._llm_pool.submit(self._llm_and_notify, text)
+
+    def _llm_and_notify(self, text: str):
+        try:
+            optimized = self._optimize_text_with_llm(text)
+            if optimized != text and self.update_callback:
+                self.update_callback(optimized)
+        except Exception as e:
+            logger.error(f"后台大模型优化失败: {e}")
         
     def start_recognition(self):
         """开始语音识别"""
@@ -205,69 +479,203 @@ class VoiceRecognizer:
                 logger.error("未配置可用的录音设备")
                 return
             
-            # 录音参数
-            duration = self.config.get('voice_recognition', 'duration', fallback=5)
+            # 录音参数（启动时的配置快照）
+            duration = self._record_duration
             
-            # 录音
-            audio_data = sd.rec(
-                int(duration * self.sample_rate),
+            # 分块读取代替sd.rec+sd.wait整段死等：
+            # stop_recognition可以随时截断，不用陪满整个duration
+            total_samples = int(duration * self.sample_rate)
+            buf = np.empty(total_samples + self.chunk_size, dtype=np.float32)
+            write_pos = 0
+
+            with sd.InputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 dtype=np.float32,
-                device=self.input_device_id
-            )
-            
-            # 等待录音完成
-            sd.wait()
-            
-            if not self.is_recording:
+                device=self.input_device_id,
+                blocksize=self.chunk_size
+            ) as stream:
+                while write_pos < total_samples and self.is_recording:
+                    audio_chunk, overflowed = stream.read(self.chunk_size)
+                    if overflowed:
+                        logger.debug("音频缓冲区溢出")
+                    mono_chunk = audio_chunk[:, 0]
+                    buf[write_pos:write_pos + len(mono_chunk)] = mono_chunk
+                    write_pos += len(mono_chunk)
+
+            if write_pos == 0:
                 return
                 
             logger.info("录音完成，开始识别...")
             
-            # 语音识别
-            text = self._recognize_audio(audio_data.flatten())
+            llm_enabled = self._llm_enabled
+
+            # 切出实际录到的样本（提前停止时短于duration）
+            mono = buf[:write_pos]
+
+            # 流式路径：每个解码完的分段立即回调，感知延迟≈首段解码时间
+            if self.faster_model is not None and self.callback and not llm_enabled:
+                self._recognize_audio(mono, on_segment=self.callback)
+                return
+
+            # 阻塞路径（openai-whisper后端）
+            text = self._recognize_audio(mono)
             
             if text and self.callback:
-                # 可选：使用大模型优化文本
-                if self.config.get('llm_optimization', 'enabled', fallback=False):
-                    text = self._optimize_text_with_llm(text)
-                    
+                # 原始识别结果立即上抛；大模型优化放到后台并行，
+                # 完成后经update_callback通知，不拖住下一轮录音
                 self.callback(text)
+
+                if llm_enabled:
+                    self._submit_llm_optimization(text)
                 
         except Exception as e:
             logger.error(f"语音识别过程中发生错误: {e}")
         finally:
             self.is_recording = False
             
-    def _recognize_audio(self, audio_data: np.ndarray) -> str:
-        """识别音频数据"""
+    def _recognize_audio(self, audio_data: np.ndarray,
+                         on_segment: Optional[Callable[[str], None]] = None) -> str:
+        """识别音频数据
+
+        on_segment: 可选的分段回调。faster-whisper的segments是惰性
+        生成器，解码一段吐一段；提供回调时每段文本解码完立即上抛，
+        长句不用等整段转写结束。
+        """
         try:
             # 快速音频预处理
-            audio_data = self._preprocess_audio_fast(audio_data)
-            
+            audio_data, rms = self._preprocess_audio_fast(audio_data)
+
+            # 静音剪辑早退：编码器前向几百毫秒，不值得花在无语音
+            # 的片段上（指纹计算也一并省掉）
+            if rms < self._SILENCE_RMS:
+                logger.info(f"音频近乎静音 (RMS: {rms:.6f})，跳过识别")
+                return ""
+
+            # 查语音指纹缓存：重复指令不再进模型
+            fp = self._audio_fingerprint(audio_data)
+            if fp is not None and fp in self._utt_cache:
+                self._utt_cache.move_to_end(fp)
+                text = self._utt_cache[fp]
+                logger.info(f"识别结果（指纹缓存命中）: {text}")
+                if on_segment is not None and text:
+                    on_segment(text)
+                return text
+
+            # faster-whisper路径：量化GEMM内核+高效解码器
+            if self.faster_model is not None:
+                segments, _info = self.faster_model.transcribe(
+                    audio_data,
+                    language='zh',
+                    task='transcribe',
+                    beam_size=1,  # 与下方openai-whisper路径一致：贪心解码求速度
+                    vad_filter=True,  # 内置VAD跳过静音段
+                    # VAD切出的短段间互不相关，禁用前文条件化
+                    # 以免上一段文本把幻觉带进下一段
+                    condition_on_previous_text=False,
+                    without_timestamps=True
+                )
+                parts = []
+                for segment in segments:
+                    seg_text = segment.text.strip()
+                    if not seg_text:
+                        continue
+                    if on_segment is not None:
+                        on_segment(seg_text)
+                    parts.append(seg_text)
+                text = ''.join(parts)
+
+                if text:
+                    self._cache_utterance(fp, text)
+                    logger.info(f"识别结果: {text}")
+                    return text
+                logger.warning("未识别到有效文本")
+                return ""
+
+            # CPU上按配置启用bfloat16 autocast（仅torch后端用到）
+            if self.model is not None and self.cpu_bf16:
+                import torch
+                amp_ctx = torch.autocast('cpu', dtype=torch.bfloat16)
+            else:
+                amp_ctx = contextlib.nullcontext()
+
+            # whisper.cpp路径（纯CPU备选后端）
+            if self.cpp_model is not None:
+                segments = self.cpp_model.transcribe(audio_data, language='zh')
+                text = ''.join(segment.text for segment in segments).strip()
+                if text:
+                    self._cache_utterance(fp, text)
+                    logger.info(f"识别结果: {text}")
+                    return text
+                logger.warning("未识别到有效文本")
+                return ""
+
+            # 短语音快路径：手动pad+log-mel+decode，跳过transcribe
+            # 内部的分窗/重试开销（听写指令几乎都在30秒窗口内）
+            if len(audio_data) <= whisper.audio.N_SAMPLES:
+                try:
+                    mel = whisper.log_mel_spectrogram(
+                        whisper.pad_or_trim(audio_data),
+                        n_mels=self.model.dims.n_mels
+                    )
+                    if self.device == "cuda":
+                        # 复用锁页/显存缓冲：免去每句的张量分配，
+                        # 锁页内存让H2D拷贝走异步DMA
+                        import torch
+                        if self._mel_pinned is None:
+                            self._mel_pinned = torch.empty(
+                                mel.shape, dtype=mel.dtype, pin_memory=True)
+                            self._mel_dev = torch.empty(
+                                mel.shape, dtype=mel.dtype, device="cuda")
+                        self._mel_pinned.copy_(mel)
+                        self._mel_dev.copy_(self._mel_pinned, non_blocking=True)
+                        mel = self._mel_dev
+                    options = whisper.DecodingOptions(
+                        language='zh',
+                        task='transcribe',
+                        temperature=0.0,
+                        fp16=(self.device == "cuda"),
+                        without_timestamps=True
+                    )
+                    with amp_ctx:
+                        decoded = whisper.decode(self.model, mel, options)
+                    text = decoded.text.strip()
+                    if text:
+                        self._cache_utterance(fp, text)
+                        logger.info(f"识别结果: {text}")
+                        return text
+                    logger.warning("未识别到有效文本")
+                    return ""
+                except Exception as e:
+                    logger.warning(f"短语音快路径失败，回退到transcribe: {e}")
+
             # 使用Whisper进行识别，优化参数提高速度
-            result = self.model.transcribe(
-                audio_data,
-                language='zh',  # 中文
-                task='transcribe',
-                temperature=0.0,  # 降低随机性
-                compression_ratio_threshold=2.0,  # 较低的压缩比阈值
-                logprob_threshold=-1.0,  # 更宽松的概率阈值，减少计算
-                no_speech_threshold=0.6,  # 提高无语音阈值，快速跳过静音
-                fp16=False,  # 禁用FP16以避免某些设备的兼容性问题
-                beam_size=1,  # 使用贪心搜索提高速度
-                best_of=1,  # 只生成一个候选
-                condition_on_previous_text=False,  # 不依赖之前的文本
-                word_timestamps=False,  # 不生成词级时间戳
-                without_timestamps=True,  # 不生成任何时间戳，进一步提速
-                initial_prompt=None,  # 不使用初始提示
-                verbose=False  # 关闭详细输出
-            )
+            with amp_ctx:
+                result = self.model.transcribe(
+                    audio_data,
+                    language='zh',  # 中文
+                    task='transcribe',
+                    temperature=0.0,  # 降低随机性
+                    compression_ratio_threshold=2.0,  # 较低的压缩比阈值
+                    logprob_threshold=-1.0,  # 更宽松的概率阈值，减少计算
+                    no_speech_threshold=0.6,  # 提高无语音阈值，快速跳过静音
+                    fp16=(self.device == "cuda"),  # GPU上用FP16吃满tensor core
+                    beam_size=1,  # 使用贪心搜索提高速度
+                    best_of=1,  # 只生成一个候选
+                    # 超过30秒的长录音会切成多个窗口，开启前文条件化
+                    # 才能跨窗口复用解码器KV缓存（短录音只有一个窗口，
+                    # 此参数无副作用）
+                    condition_on_previous_text=True,
+                    word_timestamps=False,  # 不生成词级时间戳
+                    without_timestamps=True,  # 不生成任何时间戳，进一步提速
+                    initial_prompt=None,  # 不使用初始提示
+                    verbose=False  # 关闭详细输出
+                )
             
             text = result.get('text', '').strip()
             
             if text:
+                self._cache_utterance(fp, text)
                 logger.info(f"识别结果: {text}")
                 return text
             else:
@@ -278,35 +686,62 @@ class VoiceRecognizer:
             logger.error(f"音频识别失败: {e}")
             return ""
             
-    def _preprocess_audio_fast(self, audio_data: np.ndarray) -> np.ndarray:
-        """快速音频预处理，减少延迟"""
+    _UTT_CACHE_SIZE = 256
+    _SILENCE_RMS = 0.002  # 低于该RMS视为静音剪辑，直接跳过识别
+
+    def _audio_fingerprint(self, audio_data: np.ndarray) -> Optional[bytes]:
+        """计算粗粒度声学指纹（量化的对数梅尔谱哈希）"""
+        try:
+            import librosa
+            mel = librosa.feature.melspectrogram(
+                y=audio_data, sr=self.sample_rate, n_mels=16, hop_length=512)
+            # 粗量化到1位小数：容忍重复发音间的微小声学差异
+            sketch = np.round(np.log1p(mel), 1)
+            return hashlib.blake2b(sketch.tobytes(), digest_size=16).digest()
+        except Exception as e:
+            logger.debug(f"声学指纹计算失败: {e}")
+            return None
+
+    def _cache_utterance(self, fp: Optional[bytes], text: str):
+        """写入指纹缓存并按LRU淘汰"""
+        if fp is None:
+            return
+        self._utt_cache[fp] = text
+        self._utt_cache.move_to_end(fp)
+        if len(self._utt_cache) > self._UTT_CACHE_SIZE:
+            self._utt_cache.popitem(last=False)
+
+    def _preprocess_audio_fast(self, audio_data: np.ndarray):
+        """快速音频预处理，减少延迟
+
+        返回(处理后音频, 去直流后的RMS)，RMS供调用方做静音早退。
+        """
         
         # 检查音频有效性
         if len(audio_data) == 0 or np.all(audio_data == 0):
             logger.warning("音频数据为空或全零")
-            return np.zeros(self.sample_rate, dtype=np.float32)  # 返回1秒的静音
-        
-        # 去除直流分量
-        audio_data = audio_data - audio_data.mean()
+            return np.zeros(self.sample_rate, dtype=np.float32), 0.0
         
-        # 检查音频质量
-        rms = np.sqrt(np.mean(audio_data ** 2))
-        max_amplitude = np.max(np.abs(audio_data))
+        audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
+
+        if NUMBA_AVAILABLE:
+            # 融合内核：去直流+统计+归一化一趟完成（原地写回）
+            rms, max_amplitude = _preprocess_kernel(audio_data)
+        else:
+            # numpy退路：仍避免中间平方数组（dot）并原地归一化
+            audio_data -= audio_data.mean(dtype=np.float64)
+            rms = np.sqrt(np.dot(audio_data, audio_data) / len(audio_data))
+            max_amplitude = np.abs(audio_data).max()
+            if max_amplitude > 0:
+                audio_data *= 0.6 / max_amplitude
         
         logger.debug(f"音频预处理 - RMS: {rms:.4f}, Max: {max_amplitude:.4f}, 长度: {len(audio_data)/self.sample_rate:.2f}秒")
         
-        # 归一化
-        if max_amplitude > 0:
-            audio_data = audio_data * (0.6 / max_amplitude)
-        
         # 简单的噪声检测
         if rms < 0.001:
             logger.warning(f"音频能量过低 (RMS: {rms:.6f})，可能是静音或音量太小")
         
-        # 确保数据类型为float32
-        audio_data = audio_data.astype(np.float32)
-        
-        return audio_data
+        return audio_data, rms
 
     def _optimize_text_with_llm(self, text: str) -> str:
         """使用大模型优化文本"""
@@ -320,31 +755,28 @@ class VoiceRecognizer:
                 logger.warning("未配置OpenAI API Key，跳过大模型优化")
                 return text
                 
-            client = openai.OpenAI(api_key=api_key)
-            
-            system_prompt = """你是一个专业的中文语音识别文本优化助手。请对用户的语音识别文本进行优化，包括：
-1. 纠正语音识别错误（同音字、近音字错误）
-2. 添加合适的标点符号
-3. 规范化表达（口语转书面语）
-4. 处理数字和专业术语
-5. 保持原意不变
-
-注意：
-- 优先考虑中文语境和习惯表达
-- 如果原文本过于模糊或错误，保持原样
-- 只返回优化后的文本，不要添加任何解释或标记"""
+            # 复用客户端：每次新建OpenAI()都会重建httpx连接池，
+            # 相当于每句话多付一次TCP+TLS握手
+            if self._openai_client is None or self._openai_client_key != api_key:
+                self._openai_client = openai.OpenAI(api_key=api_key)
+                self._openai_client_key = api_key
+            client = self._openai_client
             
+            # 流式请求：首token到达即开始累积，不等整个补全生成完
             response = client.chat.completions.create(
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": text}
-                ],
+                messages=[_LLM_SYS_MSG, {"role": "user", "content": text}],
                 temperature=0.3,
-                max_tokens=200
+                max_tokens=128,  # 听写句子很短，压低上限加快返回
+                stream=True
             )
             
-            optimized_text = response.choices[0].message.content.strip()
+            parts = []
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+            optimized_text = ''.join(parts).strip()
             logger.info(f"大模型优化后: {optimized_text}")
             return optimized_text
             
@@ -372,6 +804,9 @@ class VoiceRecognizer:
     def stop(self):
         """停止语音识别器"""
         self.stop_recognition()
+        if self._llm_pool is not None:
+            self._llm_pool.shutdown(wait=False)
+            self._llm_pool = None
         logger.info("语音识别器已停止")
 
 
@@ -389,10 +824,24 @@ class ContinuousVoiceRecognizer(VoiceRecognizer):
         self.is_auto_recording = False
         self.last_activity_time = 0
         self.debug_counter = 0
+
+        # 自适应VAD状态：噪声底EMA+连续命中计数
+        self._noise_floor = 0.0
+        self._vad_hits = 0
+        self._vad_min_hits = 2  # 连续超阈值帧数（2帧≈128ms）才触发
+
+        # 监听环形缓冲：预分配1秒，回调里只做切片写入（无分配、
+        # 无锁），留住VAD确认前的那段语音开头
+        self._ring = np.zeros(self.sample_rate, dtype=np.float32)
+        self._ring_w = 0
+        self._ring_filled = 0
         
     def _load_continuous_params(self):
         """加载连续识别参数"""
         self.vad_threshold = float(self.config.get('voice_recognition', 'vad_threshold', fallback=0.020))
+        # 刷新基类的配置快照（reload_config复用本方法）
+        self._llm_enabled = bool(self.config.get('llm_optimization', 'enabled', fallback=False))
+        self._record_duration = float(self.config.get('voice_recognition', 'duration', fallback=5))
         self.auto_recording_duration = float(self.config.get('voice_recognition', 'auto_recording_duration', fallback=2.5))
         self.cooldown_time = float(self.config.get('voice_recognition', 'cooldown_time', fallback=0.3))
         
@@ -402,6 +851,17 @@ class ContinuousVoiceRecognizer(VoiceRecognizer):
         self.max_recording_duration = min(self.auto_recording_duration, 8.0)  # 最大录音时长
         self.silence_duration_to_stop = 0.5  # 静音多久后停止录音（减少到0.5秒）
         
+        # 预分配录音缓冲区：动态录音按切片写入，
+        # 免去Python列表逐块append+concatenate的拷贝
+        buf_samples = int(self.max_recording_duration * self.sample_rate) + self.chunk_size
+        self._record_buf = np.empty(buf_samples, dtype=np.float32)
+
+        # 监听回调直写录音缓冲的游标：录音复用监听的InputStream，
+        # 不再每句重开一条PortAudio流（开流几十毫秒，还和监听流
+        # 抢同一设备），块也不经过中间队列拷贝
+        self._rec_write = 0
+        self._chunk_event = threading.Event()
+
         logger.info(f"连续识别参数 - VAD阈值: {self.vad_threshold:.3f}, 动态录音: {self.dynamic_recording}")
         if self.dynamic_recording:
             logger.info(f"智能动态录音 - 范围: {self.min_recording_duration}-{self.max_recording_duration}秒, 静音停止: {self.silence_duration_to_stop}秒")
@@ -430,6 +890,7 @@ class ContinuousVoiceRecognizer(VoiceRecognizer):
         """停止连续监听"""
         self.is_monitoring = False
         self.is_auto_recording = False
+        self._chunk_event.set()  # 唤醒可能在等块的录音消费者
         if self.recording_thread and self.recording_thread.is_alive():
             self.recording_thread.join(timeout=1)
         logger.info("连续语音监听已停止")
@@ -439,25 +900,70 @@ class ContinuousVoiceRecognizer(VoiceRecognizer):
         chunk_size = 1024
         sample_rate = self.sample_rate
         
-        def audio_callback(indata, frames, time, status):
+        def audio_callback(indata, frames, time_info, status):
             if status:
                 return
                 
-            # 计算音频能量
             audio_chunk = indata[:, 0]
-            energy = np.sqrt(np.mean(audio_chunk ** 2))
+            ring = self._ring
+            n = len(audio_chunk)
+
+            if NUMBA_AVAILABLE:
+                # 合并内核：能量+环形写入一趟完成，期间释放GIL
+                energy, self._ring_w = _monitor_kernel(
+                    audio_chunk, ring, self._ring_w)
+            else:
+                # 计算音频能量（dot避免生成中间平方数组）
+                energy = np.sqrt(np.dot(audio_chunk, audio_chunk) / n)
+
+                # 写入环形缓冲（跨界时拆成两段切片写）
+                ring_len = len(ring)
+                w = self._ring_w
+                end = w + n
+                if end <= ring_len:
+                    ring[w:end] = audio_chunk
+                else:
+                    split = ring_len - w
+                    ring[w:] = audio_chunk[:split]
+                    ring[:end - ring_len] = audio_chunk[split:]
+                self._ring_w = end % ring_len
+            if self._ring_filled < len(ring):
+                self._ring_filled = min(self._ring_filled + n, len(ring))
             
             # 定期显示监听状态
             self.debug_counter += 1
             if self.debug_counter % 100 == 0:  # 每100个chunk显示一次
                 logger.debug(f"监听中... 当前能量: {energy:.4f}, 阈值: {self.vad_threshold:.4f}")
             
-            # 检测语音活动
-            if energy > self.vad_threshold:
-                self.last_activity_time = time.inputBufferAdcTime
+            # 自适应触发线：配置阈值为下限，叠加3倍环境噪声底，
+            # 嘈杂环境下不被持续底噪误触发
+            threshold = self.vad_threshold
+            if self._noise_floor > 0.0:
+                threshold = max(threshold, self._noise_floor * 3.0)
+
+            # 录音进行中：直接写进预分配录音缓冲（监听流身兼采集
+            # 流，无队列无拷贝），游标更新后唤醒消费者
+            if self.is_auto_recording:
+                rec_buf = self._record_buf
+                w = self._rec_write
+                if w + n <= len(rec_buf):
+                    rec_buf[w:w + n] = audio_chunk
+                    self._rec_write = w + n
+                self._chunk_event.set()
+
+            # 检测语音活动：要求连续多帧超阈值，单帧毛刺不算
+            if energy > threshold:
+                self._vad_hits += 1
+                self.last_activity_time = time_info.inputBufferAdcTime
                 
-                # 如果检测到语音且当前没有录音，开始录音
-                if not self.is_auto_recording and not self.is_recording:
+                # 如果确认语音且当前没有录音，开始录音
+                if (self._vad_hits >= self._vad_min_hits
+                        and not self.is_auto_recording and not self.is_recording):
+                    # 在回调里（与环形写同线程）取音头垫进录音缓冲：
+                    # 消费者稍后才启动，这时取才不会与后续块重叠
+                    lead = self._ring_tail(int(0.25 * self.sample_rate))
+                    self._record_buf[:len(lead)] = lead
+                    self._rec_write = len(lead)
                     self.is_auto_recording = True
                     logger.info(f"🎤 检测到语音 (能量: {energy:.4f})，开始录音...")
                     
@@ -466,6 +972,13 @@ class ContinuousVoiceRecognizer(VoiceRecognizer):
                         target=self._auto_record_and_recognize,
                         daemon=True
                     ).start()
+            else:
+                self._vad_hits = 0
+                # 静音帧慢速EMA跟踪噪声底（语音帧不参与，避免抬高基线）
+                if self._noise_floor == 0.0:
+                    self._noise_floor = energy
+                else:
+                    self._noise_floor = 0.95 * self._noise_floor + 0.05 * energy
                     
         try:
             with sd.InputStream(
@@ -508,17 +1021,31 @@ class ContinuousVoiceRecognizer(VoiceRecognizer):
                 
             logger.info("⚡ 录音完成，开始识别...")
             
-            # 语音识别
+            llm_enabled = self._llm_enabled
+
+            # 流式路径：分段边解码边标点处理并上抛，不等整段转写
+            if self.faster_model is not None and self.callback and not llm_enabled:
+                def emit(seg_text: str):
+                    if LOCAL_PUNCTUATION_AVAILABLE:
+                        seg_text = self._add_local_punctuation(seg_text)
+                    self.callback(seg_text)
+
+                self._recognize_audio(audio_data, on_segment=emit)
+                return
+
+            # 阻塞路径（openai-whisper后端）
             text = self._recognize_audio(audio_data)
             
             if text and self.callback:
-                # 文本优化：大模型 > 本地标点处理器 > 原始文本
-                if self.config.get('llm_optimization', 'enabled', fallback=False):
-                    text = self._optimize_text_with_llm(text)
-                elif LOCAL_PUNCTUATION_AVAILABLE:
+                # 本地标点处理后立即上抛；大模型优化放到后台并行，
+                # 完成后经update_callback通知
+                if LOCAL_PUNCTUATION_AVAILABLE:
                     text = self._add_local_punctuation(text)
                     
                 self.callback(text)
+
+                if llm_enabled:
+                    self._submit_llm_optimization(text)
                 
         except Exception as e:
             logger.error(f"自动录音识别过程中发生错误: {e}")
@@ -531,66 +1058,73 @@ class ContinuousVoiceRecognizer(VoiceRecognizer):
         """动态时长录音：根据语音活动自动确定录音长度"""
         logger.info("🎙️ 开始动态录音...")
         
-        # 录音缓冲区
-        audio_buffer = []
-        chunk_size = 1024
-        chunk_duration = chunk_size / self.sample_rate
+        # 回调直写录音缓冲，本线程只顺着游标消费视图
+        buf = self._record_buf
+        read_pos = 0
         
-        # 状态变量
+        # 状态变量（音头部分计入已录时长）
         recording_time = 0.0
         silence_time = 0.0
         
         try:
-            with sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                dtype=np.float32,
-                device=self.input_device_id,
-                blocksize=chunk_size
-            ) as stream:
+            while recording_time < self.max_recording_duration and self.is_monitoring:
+                write_pos = self._rec_write
+                if write_pos == read_pos:
+                    # 等监听回调写入下一块（事件驱动，超时防挂死）
+                    self._chunk_event.wait(timeout=0.5)
+                    self._chunk_event.clear()
+                    continue
+
+                # 新到达的数据段（零拷贝视图）
+                mono_chunk = buf[read_pos:write_pos]
+                n = write_pos - read_pos
+                read_pos = write_pos
+                chunk_duration = n / self.sample_rate
+                recording_time += chunk_duration
                 
-                while recording_time < self.max_recording_duration and self.is_monitoring:
-                    # 读取音频块
-                    audio_chunk, overflowed = stream.read(chunk_size)
-                    if overflowed:
-                        logger.debug("音频缓冲区溢出")
-                    
-                    # 添加到缓冲区
-                    audio_buffer.append(audio_chunk.flatten())
-                    recording_time += chunk_duration
-                    
-                    # 计算当前块的能量
-                    energy = np.sqrt(np.mean(audio_chunk.flatten() ** 2))
-                    
-                    # 判断是否为静音
-                    if energy < self.vad_threshold * 0.3:  # 静音阈值更严格
-                        silence_time += chunk_duration
-                    else:
-                        silence_time = 0.0  # 重置静音计时
+                # 计算音频能量（dot避免中间平方数组）
+                energy = np.sqrt(np.dot(mono_chunk, mono_chunk) / n)
+                
+                # 判断是否为静音
+                if energy < self.vad_threshold * 0.3:  # 静音阈值更严格
+                    silence_time += chunk_duration
+                else:
+                    silence_time = 0.0  # 重置静音计时
+                
+                # 提前停止条件
+                if (recording_time >= self.min_recording_duration and 
+                    silence_time >= self.silence_duration_to_stop):
+                    logger.info(f"🔇 检测到静音 {silence_time:.1f}秒，提前结束录音")
+                    break
                     
-                    # 提前停止条件
-                    if (recording_time >= self.min_recording_duration and 
-                        silence_time >= self.silence_duration_to_stop):
-                        logger.info(f"🔇 检测到静音 {silence_time:.1f}秒，提前结束录音")
-                        break
-                        
-                    # 每0.5秒显示一次状态
-                    if int(recording_time * 2) != int((recording_time - chunk_duration) * 2):
-                        logger.debug(f"录音中... {recording_time:.1f}s, 能量: {energy:.4f}, 静音: {silence_time:.1f}s")
+                # 每0.5秒显示一次状态
+                if int(recording_time * 2) != int((recording_time - chunk_duration) * 2):
+                    logger.debug(f"录音中... {recording_time:.1f}s, 能量: {energy:.4f}, 静音: {silence_time:.1f}s")
         
         except Exception as e:
             logger.error(f"动态录音过程中出错: {e}")
             return None
         
-        # 合并音频数据
-        if audio_buffer:
-            audio_data = np.concatenate(audio_buffer)
+        # 取出有效段（复制一份，缓冲区下次录音继续复用）
+        if read_pos > 0:
+            audio_data = buf[:read_pos].copy()
             logger.info(f"✅ 动态录音完成，实际时长: {recording_time:.1f}秒")
             return audio_data
         else:
             logger.warning("录音缓冲区为空")
             return None
     
+    def _ring_tail(self, samples: int) -> np.ndarray:
+        """取环形缓冲中最近samples个样本的连续副本"""
+        samples = min(samples, self._ring_filled)
+        if samples <= 0:
+            return np.empty(0, dtype=np.float32)
+        w = self._ring_w
+        if samples <= w:
+            return self._ring[w - samples:w].copy()
+        head = samples - w
+        return np.concatenate((self._ring[-head:], self._ring[:w]))
+
     def _fixed_duration_record(self):
         """固定时长录音：向后兼容的录音方式"""
         duration_samples = int(self.auto_recording_duration * self.sample_rate)
@@ -606,4 +1140,5 @@ class ContinuousVoiceRecognizer(VoiceRecognizer):
         
         # 等待录音完成
         sd.wait()
-        return audio_data.flatten() 
\ No newline at end of file
+        # 取列视图代替flatten，省一次整段复制
+        return audio_data[:, 0]
@@ -15,9 +15,155 @@ from PyQt5.QtGui import QFont, QIcon, QPixmap, QPalette, QColor
 from loguru import logger
 import json
 import os
+import threading
 from pathlib import Path
 
 
+# 固定文案提升为模块级常量（不随标签页构建重建）
+_HOTKEY_HELP = """
+热键格式说明：
+- 单个键：F9, Space, Enter 等
+- 组合键：Ctrl+F9, Alt+Space, Shift+Enter 等
+- 支持的修饰键：Ctrl, Alt, Shift, Win
+
+常用热键建议：
+- 开始录音：F9 或 Ctrl+Space
+- 停止录音：F10 或 Ctrl+Shift+Space
+- 切换录音：F11
+- 显示窗口：Ctrl+F12
+        """
+
+_FEATURES_TEXT = """
+✓ 基于Whisper的高精度中文语音识别
+✓ 支持多种文本输入方式（剪贴板、模拟键盘、Windows API）
+✓ 全局热键支持，方便快捷操作
+✓ 大模型优化，提升识别准确度
+✓ 智能应用程序适配（Excel、Word、微信等）
+✓ 系统托盘运行，不占用桌面空间
+✓ 完全本地化，保护隐私安全
+✓ 可自定义配置，满足不同需求
+        """
+
+_DEFAULT_SYSTEM_PROMPT = (
+    "你是一个专业的文本优化助手。请对用户的语音识别文本进行优化，包括：\n"
+    "1. 纠正语音识别错误\n"
+    "2. 添加合适的标点符号\n"
+    "3. 规范化表达\n"
+    "4. 保持原意不变\n"
+    "请直接返回优化后的文本，不要添加任何解释。"
+)
+
+
+# 设置项Schema：控件属性、配置段、键、缺省值、控件类型
+# load/save由同一张表驱动；按标签页索引分组，配合惰性构建
+_FIELD_SCHEMA = {
+    0: (
+        ('model_combo', 'voice_recognition', 'model', 'base', 'combo'),
+        ('language_combo', 'voice_recognition', 'language', 'zh', 'combo'),
+        ('duration_spin', 'voice_recognition', 'duration', 5, 'spin'),
+        ('sample_rate_combo', 'voice_recognition', 'sample_rate', '16000', 'combo'),
+        ('noise_reduction_check', 'voice_recognition', 'noise_reduction', True, 'check'),
+        ('auto_stop_check', 'voice_recognition', 'auto_stop', True, 'check'),
+        ('vad_threshold_slider', 'voice_recognition', 'vad_threshold', 0.020, 'slider_x1000'),
+        ('auto_duration_spin', 'voice_recognition', 'auto_recording_duration', 2.5, 'spin'),
+        ('cooldown_spin', 'voice_recognition', 'cooldown_time', 0.3, 'spin'),
+        ('dynamic_recording_check', 'voice_recognition', 'dynamic_recording', True, 'check'),
+        ('silence_threshold_slider', 'voice_recognition', 'silence_threshold', 0.01, 'slider_x100'),
+        ('min_length_spin', 'voice_recognition', 'min_recording_length', 0.5, 'spin'),
+    ),
+    1: (
+        ('start_hotkey_edit', 'hotkeys', 'start_recording', 'f9', 'text'),
+        ('stop_hotkey_edit', 'hotkeys', 'stop_recording', 'f10', 'text'),
+        ('toggle_hotkey_edit', 'hotkeys', 'toggle_recording', 'f11', 'text'),
+        ('show_window_hotkey_edit', 'hotkeys', 'show_window', 'ctrl+f12', 'text'),
+    ),
+    2: (
+        ('input_method_combo', 'text_input', 'method', 'clipboard', 'combo'),
+        ('smart_mode_check', 'text_input', 'smart_mode', True, 'check'),
+        ('auto_capitalize_check', 'text_input', 'auto_capitalize', True, 'check'),
+        ('auto_punctuation_check', 'text_input', 'auto_punctuation', True, 'check'),
+    ),
+    3: (
+        ('llm_enabled_check', 'llm_optimization', 'enabled', False, 'check'),
+        ('llm_model_combo', 'llm_optimization', 'model', 'gpt-3.5-turbo', 'combo'),
+        ('api_key_edit', 'llm_optimization', 'api_key', '', 'text'),
+        ('api_base_edit', 'llm_optimization', 'api_base', '', 'text'),
+        ('temperature_slider', 'llm_optimization', 'temperature', 0.3, 'slider_x100'),
+        ('max_tokens_spin', 'llm_optimization', 'max_tokens', 200, 'spin'),
+        ('system_prompt_edit', 'llm_optimization', 'system_prompt', '', 'plain'),
+    ),
+    4: (
+        ('theme_combo', 'ui', 'theme', 'light', 'combo'),
+        ('language_ui_combo', 'ui', 'language', 'zh_CN', 'combo'),
+        ('start_minimized_check', 'ui', 'start_minimized', True, 'check'),
+        ('show_notifications_check', 'ui', 'show_notifications', True, 'check'),
+        ('always_on_top_check', 'ui', 'always_on_top', False, 'check'),
+        ('opacity_slider', 'ui', 'window_opacity', 0.95, 'slider_x100'),
+        ('log_level_combo', 'advanced', 'log_level', 'INFO', 'combo'),
+        ('log_retention_spin', 'advanced', 'log_retention', 7, 'spin'),
+    ),
+}
+
+
+def _str_to_bool(value) -> bool:
+    """配置字符串转布尔（与ConfigManager约定一致）"""
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('true', '1', 'yes', 'on')
+
+
+# 控件类型 -> 写入/读出函数（slider按比例存浮点）
+_WIDGET_SETTERS = {
+    'combo': lambda w, v: w.setCurrentText(str(v)),
+    'text': lambda w, v: w.setText(str(v)),
+    'plain': lambda w, v: w.setPlainText(str(v)),
+    'check': lambda w, v: w.setChecked(_str_to_bool(v)),
+    'spin': lambda w, v: w.setValue(int(float(v))),
+    'slider_x100': lambda w, v: w.setValue(int(float(v) * 100)),
+    'slider_x1000': lambda w, v: w.setValue(int(float(v) * 1000)),
+}
+
+_WIDGET_GETTERS = {
+    'combo': lambda w: w.currentText(),
+    'text': lambda w: w.text(),
+    'plain': lambda w: w.toPlainText(),
+    'check': lambda w: str(w.isChecked()),
+    'spin': lambda w: str(w.value()),
+    'slider_x100': lambda w: str(w.value() / 100),
+    'slider_x1000': lambda w: str(w.value() / 1000),
+}
+
+
+def _throttled(handler, interval_ms=40):
+    """节流包装valueChanged处理器
+
+    拖动滑块时每个整数步进都发valueChanged，逐次setText会带来
+    一连串标签重排。这里用单发QTimer把interval_ms窗口内的事件
+    合并成一次，按最后取到的值执行（尾沿触发）。
+    """
+    timer = QTimer()
+    timer.setSingleShot(True)
+    timer.setInterval(interval_ms)
+    pending = []
+
+    def fire():
+        if pending:
+            handler(pending[-1])
+            pending.clear()
+
+    timer.timeout.connect(fire)
+
+    def on_value(value):
+        pending.append(value)
+        if not timer.isActive():
+            timer.start()
+
+    # 把timer挂在包装函数上防止被回收
+    on_value._timer = timer
+    return on_value
+
+
+
 class VoiceTestThread(QThread):
     """语音测试线程"""
     finished = pyqtSignal(str)
@@ -25,7 +171,8 @@ class VoiceTestThread(QThread):
     def __init__(self, voice_recognizer):
         super().__init__()
         self.voice_recognizer = voice_recognizer
-        
+        self._done = threading.Event()
+
     def run(self):
         """运行语音测试"""
         original_callback = None
@@ -38,18 +185,22 @@ class VoiceTestThread(QThread):
                 nonlocal result_text
                 if text.strip():  # 避免空文本
                     result_text = text
-                
+                self._done.set()
+
+            self._done.clear()
             self.voice_recognizer.set_callback(test_callback)
             self.voice_recognizer.start_recognition()
             
-            # 等待识别完成
-            while self.voice_recognizer.is_recording:
-                self.msleep(100)
-                
+            # 等待识别完成：回调一到立即唤醒；识别结果为空时
+            # 回调不触发，用粗粒度检查录音状态兜底
+            while not self._done.wait(timeout=0.5):
+                if not self.voice_recognizer.is_recording:
+                    break
+
             self.finished.emit(result_text)
             
         except Exception as e:
-            logger.error(f"语音测试失败: {e}")
+            logger.error("语音测试失败: {}", e)
             self.finished.emit(f"测试失败: {e}")
         finally:
             # 确保恢复原回调
@@ -65,6 +216,7 @@ class MainWindow(QMainWindow):
         self.config = config_manager
         self.voice_recognizer = voice_recognizer
         self.assistant = assistant  # 添加assistant引用
+        self._message_boxes = {}  # 按图标复用的QMessageBox缓存
         
         self.init_ui()
         self.load_settings()
@@ -88,15 +240,30 @@ class MainWindow(QMainWindow):
         # 创建标签页
         self.tab_widget = QTabWidget()
         main_layout.addWidget(self.tab_widget)
-        
-        # 创建各个标签页
-        self.create_voice_tab()
-        self.create_hotkey_tab()
-        self.create_input_tab()
-        self.create_llm_tab()
-        self.create_ui_tab()
-        self.create_about_tab()
-        
+
+        # 各标签页惰性构建：先放空占位QWidget，切到哪页才真正建控件
+        # 启动时只需构建首页，其余5/6的控件开销推迟到首次切换
+        self._tab_builders = {
+            0: self.create_voice_tab,
+            1: self.create_hotkey_tab,
+            2: self.create_input_tab,
+            3: self.create_llm_tab,
+            4: self.create_ui_tab,
+            5: self.create_about_tab,
+        }
+        tab_names = ["语音识别", "热键设置", "文本输入", "大模型优化", "界面设置", "关于"]
+        self._tab_built = [False] * len(tab_names)
+        self._settings_loaded = False
+        for name in tab_names:
+            self.tab_widget.addTab(QWidget(), name)
+        self.tab_widget.currentChanged.connect(self._ensure_tab)
+
+        # 样式表在建页前一次性应用，避免逐控件setStyleSheet的重复CSS解析
+        self.apply_style()
+
+        # 首页同步构建，保证初始显示正常
+        self._ensure_tab(0)
+
         # 创建按钮区域
         button_layout = QHBoxLayout()
         
@@ -121,12 +288,37 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("准备就绪")
         
-        # 应用样式
-        self.apply_style()
-        
-    def create_voice_tab(self):
+    def _show_message(self, icon, title, text):
+        """弹出提示框（按图标惰性创建并复用，免去每次重建控件树）"""
+        box = self._message_boxes.get(icon)
+        if box is None:
+            box = QMessageBox(icon, "", "", QMessageBox.Ok, self)
+            self._message_boxes[icon] = box
+        box.setWindowTitle(title)
+        box.setText(text)
+        box.exec_()
+
+    def _ensure_tab(self, index):
+        """首次切换到某标签页时才构建其控件"""
+        if index < 0 or index >= len(self._tab_built) or self._tab_built[index]:
+            return
+
+        builder = self._tab_builders.get(index)
+        if builder is None:
+            return
+
+        builder(self.tab_widget.widget(index))
+        self._tab_built[index] = True
+
+        # 控件建好后补加载该页配置（启动时由load_settings统一处理）
+        if self._settings_loaded:
+            try:
+                self._apply_tab_schema(index)
+            except Exception as e:
+                logger.error("加载标签页设置失败: {}", e)
+
+    def create_voice_tab(self, widget):
         """创建语音识别标签页"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         
         # 语音识别模型设置
@@ -202,11 +394,11 @@ class MainWindow(QMainWindow):
         
         # 添加说明文字
         help_label = QLabel("语音检测阈值：数值越小越敏感，但可能误触发")
-        help_label.setStyleSheet("color: #666; font-size: 11px;")
+        help_label.setProperty("role", "hint")
         continuous_layout.addWidget(help_label, 4, 0, 1, 3)
         
         dynamic_help_label = QLabel("智能动态录音：根据语音长度自动调整录音时间（2秒说话录2秒，5秒说话录5秒）")
-        dynamic_help_label.setStyleSheet("color: #666; font-size: 11px;")
+        dynamic_help_label.setProperty("role", "hint")
         continuous_layout.addWidget(dynamic_help_label, 5, 0, 1, 3)
         
         layout.addWidget(continuous_group)
@@ -233,20 +425,18 @@ class MainWindow(QMainWindow):
         layout.addWidget(advanced_group)
         
         # 连接信号
-        self.silence_threshold_slider.valueChanged.connect(
+        self.silence_threshold_slider.valueChanged.connect(_throttled(
             lambda v: self.silence_threshold_label.setText(f"{v/100:.2f}")
-        )
-        
-        self.vad_threshold_slider.valueChanged.connect(
+        ))
+
+        self.vad_threshold_slider.valueChanged.connect(_throttled(
             lambda v: self.vad_threshold_label.setText(f"{v/1000:.3f}")
-        )
+        ))
         
         layout.addStretch()
-        self.tab_widget.addTab(widget, "语音识别")
-        
-    def create_hotkey_tab(self):
+
+    def create_hotkey_tab(self, widget):
         """创建热键设置标签页"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         
         # 热键设置
@@ -281,29 +471,17 @@ class MainWindow(QMainWindow):
         
         help_text = QTextEdit()
         help_text.setReadOnly(True)
+        help_text.setUndoRedoEnabled(False)  # 静态内容不需要撤销栈
         help_text.setMaximumHeight(120)
-        help_text.setPlainText("""
-热键格式说明：
-- 单个键：F9, Space, Enter 等
-- 组合键：Ctrl+F9, Alt+Space, Shift+Enter 等
-- 支持的修饰键：Ctrl, Alt, Shift, Win
-
-常用热键建议：
-- 开始录音：F9 或 Ctrl+Space
-- 停止录音：F10 或 Ctrl+Shift+Space
-- 切换录音：F11
-- 显示窗口：Ctrl+F12
-        """)
+        help_text.setPlainText(_HOTKEY_HELP)
         help_layout.addWidget(help_text)
         
         layout.addWidget(help_group)
         
         layout.addStretch()
-        self.tab_widget.addTab(widget, "热键设置")
-        
-    def create_input_tab(self):
+
+    def create_input_tab(self, widget):
         """创建文本输入标签页"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         
         # 输入方式设置
@@ -343,7 +521,7 @@ class MainWindow(QMainWindow):
         app_layout = QVBoxLayout(app_group)
         
         app_help = QLabel("为不同应用程序设置特定的输入行为")
-        app_help.setStyleSheet("color: #666; font-size: 11px;")
+        app_help.setProperty("role", "hint")
         app_layout.addWidget(app_help)
         
         self.app_list = QListWidget()
@@ -355,41 +533,43 @@ class MainWindow(QMainWindow):
         
         layout.addWidget(app_group)
         
+        # 智能模式切换
+        self.smart_mode_check.toggled.connect(self.toggle_smart_mode)
+
         layout.addStretch()
-        self.tab_widget.addTab(widget, "文本输入")
-        
-    def create_llm_tab(self):
+
+    def create_llm_tab(self, widget):
         """创建大模型优化标签页"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         
+        # 总开关放在分组外，整组禁用时开关本身保持可用
+        self.llm_enabled_check = QCheckBox("启用大模型优化")
+        layout.addWidget(self.llm_enabled_check)
+
         # 大模型设置
         llm_group = QGroupBox("大模型优化")
         llm_layout = QGridLayout(llm_group)
         
-        self.llm_enabled_check = QCheckBox("启用大模型优化")
-        llm_layout.addWidget(self.llm_enabled_check, 0, 0, 1, 2)
-        
-        llm_layout.addWidget(QLabel("提供商:"), 1, 0)
+        llm_layout.addWidget(QLabel("提供商:"), 0, 0)
         self.llm_provider_combo = QComboBox()
         self.llm_provider_combo.addItems(["OpenAI", "Azure OpenAI", "本地模型"])
-        llm_layout.addWidget(self.llm_provider_combo, 1, 1)
+        llm_layout.addWidget(self.llm_provider_combo, 0, 1)
         
-        llm_layout.addWidget(QLabel("模型:"), 2, 0)
+        llm_layout.addWidget(QLabel("模型:"), 1, 0)
         self.llm_model_combo = QComboBox()
         self.llm_model_combo.addItems(["gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"])
-        llm_layout.addWidget(self.llm_model_combo, 2, 1)
+        llm_layout.addWidget(self.llm_model_combo, 1, 1)
         
-        llm_layout.addWidget(QLabel("API Key:"), 3, 0)
+        llm_layout.addWidget(QLabel("API Key:"), 2, 0)
         self.api_key_edit = QLineEdit()
         self.api_key_edit.setEchoMode(QLineEdit.Password)
         self.api_key_edit.setPlaceholderText("请输入API Key...")
-        llm_layout.addWidget(self.api_key_edit, 3, 1)
+        llm_layout.addWidget(self.api_key_edit, 2, 1)
         
-        llm_layout.addWidget(QLabel("API Base:"), 4, 0)
+        llm_layout.addWidget(QLabel("API Base:"), 3, 0)
         self.api_base_edit = QLineEdit()
         self.api_base_edit.setPlaceholderText("https://api.openai.com/v1")
-        llm_layout.addWidget(self.api_base_edit, 4, 1)
+        llm_layout.addWidget(self.api_base_edit, 3, 1)
         
         layout.addWidget(llm_group)
         
@@ -419,29 +599,26 @@ class MainWindow(QMainWindow):
         prompt_layout = QVBoxLayout(prompt_group)
         
         self.system_prompt_edit = QTextEdit()
-        self.system_prompt_edit.setPlainText(
-            "你是一个专业的文本优化助手。请对用户的语音识别文本进行优化，包括：\n"
-            "1. 纠正语音识别错误\n"
-            "2. 添加合适的标点符号\n"
-            "3. 规范化表达\n"
-            "4. 保持原意不变\n"
-            "请直接返回优化后的文本，不要添加任何解释。"
-        )
+        self.system_prompt_edit.setPlainText(_DEFAULT_SYSTEM_PROMPT)
         prompt_layout.addWidget(self.system_prompt_edit)
         
         layout.addWidget(prompt_group)
+
+        # 随总开关整组启用/禁用的容器
+        self._llm_dependent_groups = (llm_group, param_group, prompt_group)
         
         # 连接信号
-        self.temperature_slider.valueChanged.connect(
+        self.temperature_slider.valueChanged.connect(_throttled(
             lambda v: self.temperature_label.setText(f"{v/100:.1f}")
-        )
-        
+        ))
+
+        # 启用/禁用大模型相关控件
+        self.llm_enabled_check.toggled.connect(self.toggle_llm_controls)
+
         layout.addStretch()
-        self.tab_widget.addTab(widget, "大模型优化")
-        
-    def create_ui_tab(self):
+
+    def create_ui_tab(self, widget):
         """创建界面设置标签页"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         
         # 界面设置
@@ -493,11 +670,9 @@ class MainWindow(QMainWindow):
         layout.addWidget(log_group)
         
         layout.addStretch()
-        self.tab_widget.addTab(widget, "界面设置")
-        
-    def create_about_tab(self):
+
+    def create_about_tab(self, widget):
         """创建关于标签页"""
-        widget = QWidget()
         layout = QVBoxLayout(widget)
         
         # 版本信息
@@ -515,7 +690,7 @@ class MainWindow(QMainWindow):
         
         desc_label = QLabel("高识别率的Windows语音输入助手")
         desc_label.setAlignment(Qt.AlignCenter)
-        desc_label.setStyleSheet("color: #666;")
+        desc_label.setProperty("role", "desc")
         version_layout.addWidget(desc_label)
         
         layout.addWidget(version_group)
@@ -526,17 +701,9 @@ class MainWindow(QMainWindow):
         
         features_text = QTextEdit()
         features_text.setReadOnly(True)
+        features_text.setUndoRedoEnabled(False)  # 静态内容不需要撤销栈
         features_text.setMaximumHeight(200)
-        features_text.setPlainText("""
-✓ 基于Whisper的高精度中文语音识别
-✓ 支持多种文本输入方式（剪贴板、模拟键盘、Windows API）
-✓ 全局热键支持，方便快捷操作
-✓ 大模型优化，提升识别准确度
-✓ 智能应用程序适配（Excel、Word、微信等）
-✓ 系统托盘运行，不占用桌面空间
-✓ 完全本地化，保护隐私安全
-✓ 可自定义配置，满足不同需求
-        """)
+        features_text.setPlainText(_FEATURES_TEXT)
         features_layout.addWidget(features_text)
         
         layout.addWidget(features_group)
@@ -552,27 +719,16 @@ class MainWindow(QMainWindow):
         layout.addWidget(open_source_group)
         
         layout.addStretch()
-        self.tab_widget.addTab(widget, "关于")
-        
+
     def setup_connections(self):
         """设置信号连接"""
-        # 启用/禁用大模型相关控件
-        self.llm_enabled_check.toggled.connect(self.toggle_llm_controls)
-        
-        # 智能模式切换
-        self.smart_mode_check.toggled.connect(self.toggle_smart_mode)
-        
+        # 各标签页控件的信号在对应create_*_tab里连接（控件惰性创建）
+        pass
+
     def toggle_llm_controls(self, enabled):
-        """切换大模型控件状态"""
-        controls = [
-            self.llm_provider_combo, self.llm_model_combo,
-            self.api_key_edit, self.api_base_edit,
-            self.temperature_slider, self.max_tokens_spin,
-            self.system_prompt_edit
-        ]
-        
-        for control in controls:
-            control.setEnabled(enabled)
+        """切换大模型控件状态（整组设置，Qt自动传播到子控件）"""
+        for group in self._llm_dependent_groups:
+            group.setEnabled(enabled)
             
     def toggle_smart_mode(self, enabled):
         """切换智能模式"""
@@ -582,151 +738,88 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("智能模式已禁用")
             
     def load_settings(self):
-        """加载设置"""
+        """加载设置（仅已构建的标签页，其余在_ensure_tab时补加载）"""
         try:
-            # 语音识别设置
-            self.model_combo.setCurrentText(self.config.get('voice_recognition', 'model', fallback='base'))
-            self.language_combo.setCurrentText(self.config.get('voice_recognition', 'language', fallback='zh'))
-            self.duration_spin.setValue(self.config.get('voice_recognition', 'duration', fallback=5))
-            self.sample_rate_combo.setCurrentText(self.config.get('voice_recognition', 'sample_rate', fallback='16000'))
-            self.noise_reduction_check.setChecked(self.config.get('voice_recognition', 'noise_reduction', fallback=True))
-            self.auto_stop_check.setChecked(self.config.get('voice_recognition', 'auto_stop', fallback=True))
-            
-            # 连续识别设置
-            vad_threshold = float(self.config.get('voice_recognition', 'vad_threshold', fallback=0.020))
-            self.vad_threshold_slider.setValue(int(vad_threshold * 1000))
-            self.vad_threshold_label.setText(f"{vad_threshold:.3f}")
-            
-            auto_duration = float(self.config.get('voice_recognition', 'auto_recording_duration', fallback=2.5))
-            self.auto_duration_spin.setValue(int(auto_duration))
-            
-            cooldown_time = float(self.config.get('voice_recognition', 'cooldown_time', fallback=0.3))
-            self.cooldown_spin.setValue(int(cooldown_time))
-            
-            # 动态录音设置
-            dynamic_recording = self.config.get('voice_recognition', 'dynamic_recording', fallback=True)
-            self.dynamic_recording_check.setChecked(dynamic_recording)
-            
-            # 高级设置
-            silence_threshold = float(self.config.get('voice_recognition', 'silence_threshold', fallback=0.01))
-            self.silence_threshold_slider.setValue(int(silence_threshold * 100))
-            self.silence_threshold_label.setText(f"{silence_threshold:.2f}")
-            
-            min_length = float(self.config.get('voice_recognition', 'min_recording_length', fallback=0.5))
-            self.min_length_spin.setValue(int(min_length))
-            
-            # 热键设置
-            self.start_hotkey_edit.setText(self.config.get('hotkeys', 'start_recording', fallback='f9'))
-            self.stop_hotkey_edit.setText(self.config.get('hotkeys', 'stop_recording', fallback='f10'))
-            self.toggle_hotkey_edit.setText(self.config.get('hotkeys', 'toggle_recording', fallback='f11'))
-            self.show_window_hotkey_edit.setText(self.config.get('hotkeys', 'show_window', fallback='ctrl+f12'))
-            
-            # 文本输入设置
-            self.input_method_combo.setCurrentText(self.config.get('text_input', 'method', fallback='clipboard'))
-            self.smart_mode_check.setChecked(self.config.get('text_input', 'smart_mode', fallback=True))
-            self.auto_capitalize_check.setChecked(self.config.get('text_input', 'auto_capitalize', fallback=True))
-            self.auto_punctuation_check.setChecked(self.config.get('text_input', 'auto_punctuation', fallback=True))
-            
-            # 大模型设置
-            self.llm_enabled_check.setChecked(self.config.get('llm_optimization', 'enabled', fallback=False))
-            self.llm_model_combo.setCurrentText(self.config.get('llm_optimization', 'model', fallback='gpt-3.5-turbo'))
-            self.api_key_edit.setText(self.config.get('llm_optimization', 'api_key', fallback=''))
-            self.api_base_edit.setText(self.config.get('llm_optimization', 'api_base', fallback=''))
-            self.temperature_slider.setValue(int(self.config.get('llm_optimization', 'temperature', fallback=0.3) * 100))
-            self.max_tokens_spin.setValue(self.config.get('llm_optimization', 'max_tokens', fallback=200))
-            self.system_prompt_edit.setPlainText(self.config.get('llm_optimization', 'system_prompt', fallback=''))
-            
-            # 界面设置
-            self.theme_combo.setCurrentText(self.config.get('ui', 'theme', fallback='light'))
-            self.language_ui_combo.setCurrentText(self.config.get('ui', 'language', fallback='zh_CN'))
-            self.start_minimized_check.setChecked(self.config.get('ui', 'start_minimized', fallback=True))
-            self.show_notifications_check.setChecked(self.config.get('ui', 'show_notifications', fallback=True))
-            self.always_on_top_check.setChecked(self.config.get('ui', 'always_on_top', fallback=False))
-            self.opacity_slider.setValue(int(self.config.get('ui', 'window_opacity', fallback=0.95) * 100))
-            
-            # 日志设置
-            self.log_level_combo.setCurrentText(self.config.get('advanced', 'log_level', fallback='INFO'))
-            self.log_retention_spin.setValue(self.config.get('advanced', 'log_retention', fallback=7))
-            
-            # 初始化控件状态
-            self.toggle_llm_controls(self.llm_enabled_check.isChecked())
-            
+            # 批量填充期间不重绘
+            self.setUpdatesEnabled(False)
+            try:
+                for index, built in enumerate(self._tab_built):
+                    if built:
+                        self._apply_tab_schema(index)
+            finally:
+                self.setUpdatesEnabled(True)
+
+            self._settings_loaded = True
             logger.info("设置已加载")
-            
+
         except Exception as e:
-            logger.error(f"加载设置失败: {e}")
-            QMessageBox.warning(self, "错误", f"加载设置失败: {e}")
-            
+            logger.error("加载设置失败: {}", e)
+            self._show_message(QMessageBox.Warning, "错误", f"加载设置失败: {e}")
+
+    def _apply_tab_schema(self, index):
+        """按Schema把配置批量写入该标签页的控件
+
+        每个配置段只做一次get_section整段读取，逐项分发给
+        对应类型的setter，代替原来每控件一次config.get。
+        """
+        rows = _FIELD_SCHEMA.get(index, ())
+        if not rows:
+            return
+
+        sections = {s: self.config.get_section(s) for s in {row[1] for row in rows}}
+
+        # 填充时屏蔽控件信号，避免setValue/setCurrentText逐项触发
+        # valueChanged等回调（标签同步、toggle_llm_controls）
+        widgets = [getattr(self, row[0]) for row in rows]
+        for w in widgets:
+            w.blockSignals(True)
+        try:
+            for (attr, section, key, default, kind), w in zip(rows, widgets):
+                value = sections[section].get(key, default)
+                _WIDGET_SETTERS[kind](w, value)
+        finally:
+            for w in widgets:
+                w.blockSignals(False)
+
+        # 信号被屏蔽期间关联状态不会自动同步，按最终值补一次
+        if index == 0:
+            self.vad_threshold_label.setText(f"{self.vad_threshold_slider.value() / 1000:.3f}")
+            self.silence_threshold_label.setText(f"{self.silence_threshold_slider.value() / 100:.2f}")
+        elif index == 3:
+            self.temperature_label.setText(f"{self.temperature_slider.value() / 100:.1f}")
+            self.toggle_llm_controls(self.llm_enabled_check.isChecked())
+
+    def _collect_tab_schema(self, index, data):
+        """按Schema把该标签页控件值收集进{section: {key: value}}"""
+        for attr, section, key, _default, kind in _FIELD_SCHEMA.get(index, ()):
+            data.setdefault(section, {})[key] = _WIDGET_GETTERS[kind](getattr(self, attr))
+
     def save_settings(self):
-        """保存设置"""
+        """保存设置（未构建的标签页没有改动，保持配置原值）"""
         try:
-            # 语音识别设置
-            self.config.set('voice_recognition', 'model', self.model_combo.currentText())
-            self.config.set('voice_recognition', 'language', self.language_combo.currentText())
-            self.config.set('voice_recognition', 'duration', str(self.duration_spin.value()))
-            self.config.set('voice_recognition', 'sample_rate', self.sample_rate_combo.currentText())
-            self.config.set('voice_recognition', 'noise_reduction', str(self.noise_reduction_check.isChecked()))
-            self.config.set('voice_recognition', 'auto_stop', str(self.auto_stop_check.isChecked()))
-            
-            # 连续识别设置
-            self.config.set('voice_recognition', 'vad_threshold', str(self.vad_threshold_slider.value() / 1000))
-            self.config.set('voice_recognition', 'auto_recording_duration', str(self.auto_duration_spin.value()))
-            self.config.set('voice_recognition', 'cooldown_time', str(self.cooldown_spin.value()))
-            self.config.set('voice_recognition', 'dynamic_recording', str(self.dynamic_recording_check.isChecked()))
-            
-            # 高级设置
-            self.config.set('voice_recognition', 'silence_threshold', str(self.silence_threshold_slider.value() / 100))
-            self.config.set('voice_recognition', 'min_recording_length', str(self.min_length_spin.value()))
-            
-            # 热键设置
-            self.config.set('hotkeys', 'start_recording', self.start_hotkey_edit.text())
-            self.config.set('hotkeys', 'stop_recording', self.stop_hotkey_edit.text())
-            self.config.set('hotkeys', 'toggle_recording', self.toggle_hotkey_edit.text())
-            self.config.set('hotkeys', 'show_window', self.show_window_hotkey_edit.text())
-            
-            # 文本输入设置
-            self.config.set('text_input', 'method', self.input_method_combo.currentText())
-            self.config.set('text_input', 'smart_mode', str(self.smart_mode_check.isChecked()))
-            self.config.set('text_input', 'auto_capitalize', str(self.auto_capitalize_check.isChecked()))
-            self.config.set('text_input', 'auto_punctuation', str(self.auto_punctuation_check.isChecked()))
-            
-            # 大模型设置
-            self.config.set('llm_optimization', 'enabled', str(self.llm_enabled_check.isChecked()))
-            self.config.set('llm_optimization', 'model', self.llm_model_combo.currentText())
-            self.config.set('llm_optimization', 'api_key', self.api_key_edit.text())
-            self.config.set('llm_optimization', 'api_base', self.api_base_edit.text())
-            self.config.set('llm_optimization', 'temperature', str(self.temperature_slider.value() / 100))
-            self.config.set('llm_optimization', 'max_tokens', str(self.max_tokens_spin.value()))
-            self.config.set('llm_optimization', 'system_prompt', self.system_prompt_edit.toPlainText())
-            
-            # 界面设置
-            self.config.set('ui', 'theme', self.theme_combo.currentText())
-            self.config.set('ui', 'language', self.language_ui_combo.currentText())
-            self.config.set('ui', 'start_minimized', str(self.start_minimized_check.isChecked()))
-            self.config.set('ui', 'show_notifications', str(self.show_notifications_check.isChecked()))
-            self.config.set('ui', 'always_on_top', str(self.always_on_top_check.isChecked()))
-            self.config.set('ui', 'window_opacity', str(self.opacity_slider.value() / 100))
-            
-            # 日志设置
-            self.config.set('advanced', 'log_level', self.log_level_combo.currentText())
-            self.config.set('advanced', 'log_retention', str(self.log_retention_spin.value()))
-            
-            # 保存配置文件
+            data = {}
+            for index, built in enumerate(self._tab_built):
+                if built:
+                    self._collect_tab_schema(index, data)
+
+            # 每段一次整段写入，最后统一落盘
+            for section, options in data.items():
+                self.config.update_section(section, options)
             self.config.save_config()
-            
+
             # 重新加载语音识别配置（立即生效）
             if self.assistant:
                 self.assistant.reload_voice_config()
-            
+
             logger.info("设置已保存")
             self.status_bar.showMessage("设置已保存")
-            
-            QMessageBox.information(self, "成功", "设置已保存并生效！")
-            
+
+            self._show_message(QMessageBox.Information, "成功", "设置已保存并生效！")
+
         except Exception as e:
-            logger.error(f"保存设置失败: {e}")
-            QMessageBox.critical(self, "错误", f"保存设置失败: {e}")
-            
+            logger.error("保存设置失败: {}", e)
+            self._show_message(QMessageBox.Critical, "错误", f"保存设置失败: {e}")
+
     def test_voice_recognition(self):
         """测试语音识别"""
         try:
@@ -740,8 +833,8 @@ class MainWindow(QMainWindow):
             self.test_thread.start()
             
         except Exception as e:
-            logger.error(f"测试语音识别失败: {e}")
-            QMessageBox.critical(self, "错误", f"测试失败: {e}")
+            logger.error("测试语音识别失败: {}", e)
+            self._show_message(QMessageBox.Critical, "错误", f"测试失败: {e}")
             self.test_button.setText("测试语音识别")
             self.test_button.setEnabled(True)
             
@@ -752,10 +845,10 @@ class MainWindow(QMainWindow):
         
         if result:
             self.status_bar.showMessage(f"识别结果: {result}")
-            QMessageBox.information(self, "测试结果", f"识别结果:\n{result}")
+            self._show_message(QMessageBox.Information, "测试结果", f"识别结果:\n{result}")
         else:
             self.status_bar.showMessage("测试失败或未识别到语音")
-            QMessageBox.warning(self, "测试结果", "未识别到语音内容")
+            self._show_message(QMessageBox.Warning, "测试结果", "未识别到语音内容")
             
     def apply_style(self):
         """应用样式"""
@@ -835,6 +928,15 @@ class MainWindow(QMainWindow):
                 border-radius: 4px;
             }
             
+            QLabel[role="hint"] {
+                color: #666;
+                font-size: 11px;
+            }
+            
+            QLabel[role="desc"] {
+                color: #666;
+            }
+            
             QSlider::handle:horizontal {
                 background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #b4b4b4, stop:1 #8f8f8f);
                 border: 1px solid #5c5c5c;
@@ -850,7 +952,13 @@ class MainWindow(QMainWindow):
         event.ignore()
         self.hide()
         
-        if self.show_notifications_check.isChecked():
+        # 界面标签页可能尚未构建，控件不存在时回退到配置值
+        if self._tab_built[4]:
+            show_notifications = self.show_notifications_check.isChecked()
+        else:
+            show_notifications = self.config.get('ui', 'show_notifications', fallback=True)
+
+        if show_notifications:
             from PyQt5.QtWidgets import QSystemTrayIcon
             if QSystemTrayIcon.isSystemTrayAvailable():
                 # 这里应该通过信号通知托盘图标显示消息
@@ -80,6 +80,9 @@ class VoiceInputAssistant:
         # 设置语音识别回调
         self.voice_recognizer.set_callback(self.on_text_recognized)
         
+        # 大模型优化在后台完成后，经此回调把结果投递给用户
+        self.voice_recognizer.set_update_callback(self.on_text_optimized)
+        
         logger.info("语音输入助手初始化完成")
         logger.info("热键说明: F9=切换连续识别模式, Ctrl+F12=退出程序")
         logger.info("连续识别模式: 自动检测语音并录音识别")
@@ -109,6 +112,14 @@ class VoiceInputAssistant:
             # 文本注入在单独线程中执行，避免阻塞
             threading.Thread(target=self.text_injector.inject_text, args=(text,), daemon=True).start()
                 
+    def on_text_optimized(self, text: str):
+        """大模型优化完成回调（原始文本已注入，优化结果以通知提示）"""
+        if text.strip():
+            logger.info(f"✨ 大模型优化结果: {text}")
+            if self.tray_icon:
+                QTimer.singleShot(0, lambda: self.tray_icon.show_notification(
+                    "大模型优化", text))
+
     def on_exit_hotkey_pressed(self):
         """退出热键按下回调"""
         logger.info("收到退出热键信号")
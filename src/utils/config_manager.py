@@ -164,7 +164,7 @@ class ConfigManager:
             env_key = self._get_env_key(section, key)
             env_value = os.getenv(env_key)
             if env_value is not None:
-                logger.debug(f"从环境变量获取配置: {env_key} = {env_value}")
+                logger.debug("从环境变量获取配置: {} = {}", env_key, env_value)
                 return self._convert_value(env_value, fallback)
             
             # 2. 然后检查配置文件
@@ -230,13 +230,20 @@ class ConfigManager:
             logger.error(f"设置配置失败 {section}.{key}: {e}")
             
     def get_section(self, section: str) -> Dict[str, Any]:
-        """获取整个配置段"""
+        """获取整个配置段（与get()一致，环境变量优先于配置文件）"""
         try:
             if self.config.has_section(section):
-                return dict(self.config.items(section))
+                options = dict(self.config.items(section))
             else:
-                return {}
-                
+                options = {}
+
+            for key in options:
+                env_value = os.getenv(self._get_env_key(section, key))
+                if env_value is not None:
+                    options[key] = env_value
+
+            return options
+
         except Exception as e:
             logger.error(f"获取配置段失败 {section}: {e}")
             return {}
@@ -0,0 +1,94 @@
+# -*- mode: python ; coding: utf-8 -*-
+# 语音输入助手 PyInstaller spec文件
+# 使用spec构建可以复用build/目录里的Analysis缓存：
+# 源码未变时跳过模块图分析，增量构建显著加速
+import os
+
+block_cipher = None
+
+hiddenimports = [
+    'whisper',
+    'openai',
+    'PyQt5',
+    'PyQt5.QtCore',
+    'PyQt5.QtGui',
+    'PyQt5.QtWidgets',
+    'sounddevice',
+    'pyautogui',
+    'pynput',
+    'pynput.keyboard',
+    'pynput.mouse',
+    'loguru',
+    'win32api',
+    'win32con',
+    'win32gui',
+    'win32clipboard',
+    'psutil',
+    'numpy',
+    'torch',
+    'torchaudio',
+    'librosa',
+    'dotenv',
+]
+
+excludes = [
+    'matplotlib',
+    'tk',
+    'tkinter',
+    # torch/librosa的传递依赖会拉进这些大包，运行时并不需要
+    # （scipy和sympy除外：librosa的特征提取依赖scipy，torch 2.x需要sympy）
+    'pandas',
+    'IPython',
+    'notebook',
+    'pytest',
+    'test',
+    'pydoc_data',
+]
+
+datas = [
+    ('config', 'config'),
+    ('assets', 'assets'),
+    ('env.example', '.'),
+    ('README.md', '.'),
+    ('LICENSE', '.'),
+]
+
+a = Analysis(
+    ['start_silent.py'],
+    pathex=[],
+    binaries=[],
+    datas=datas,
+    hiddenimports=hiddenimports,
+    hookspath=[],
+    runtime_hooks=[],
+    excludes=excludes,
+    cipher=block_cipher,
+    noarchive=False,
+    # 打包字节码去掉docstring/assert（只影响被打包的.pyc，不影响依赖解析）
+    optimize=2,
+)
+
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='语音输入助手',
+    debug=False,
+    strip=False,
+    upx=True,
+    console=False,
+    icon='assets/icon.ico' if os.path.exists('assets/icon.ico') else None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=True,
+    name='语音输入助手',
+)